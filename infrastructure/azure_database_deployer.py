@@ -7,20 +7,64 @@ Production-grade database infrastructure with backups, replication, and high ava
 import os
 import sys
 import json
-import subprocess
+import shutil
 import secrets
 import string
-from typing import Dict, Optional
+from typing import Dict, Optional, Tuple
 from datetime import datetime
+from pathlib import Path
 import logging
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from utils.file_utils import write_private_file  # noqa: E402
+from utils.json_utils import dump_json, loads_json  # noqa: E402
+
+# Azure CLI settings applied to every `az` invocation. Each call is a fresh
+# Python interpreter, so skip the telemetry upload process, survey prompt,
+# colorized output, warnings and on-demand extension installs that would
+# otherwise run per command.
+AZ_CLI_ENV = {
+    "AZURE_CORE_COLLECT_TELEMETRY": "false",
+    "AZURE_CORE_SURVEY_MESSAGE": "false",
+    "AZURE_CORE_NO_COLOR": "true",
+    "AZURE_CORE_ONLY_SHOW_ERRORS": "true",
+    "AZURE_EXTENSION_USE_DYNAMIC_INSTALL": "no",
+}
+
+# Azure Resource Manager endpoint used for the high-frequency server
+# updates (firewall rules, parameters), which would otherwise cost one
+# `az` process start each
+ARM_ENDPOINT = "https://management.azure.com"
+ARM_POSTGRES_API_VERSION = "2022-12-01"
+
 
 class AzureDatabaseDeployer:
     """Manages production PostgreSQL database deployment on Azure"""
 
+    # Server parameters tuned for the General Purpose 2 vCore SKU, applied in order
+    SERVER_PARAMETERS = (
+        ("max_connections", "200"),
+        ("shared_buffers", "524288"),  # 512MB in 8KB pages
+        ("effective_cache_size", "1572864"),  # 1.5GB in 8KB pages
+        ("maintenance_work_mem", "131072"),  # 128MB in KB
+        ("checkpoint_completion_target", "0.9"),
+        ("wal_buffers", "2048"),  # 16MB in 8KB pages
+        ("default_statistics_target", "100"),
+        ("random_page_cost", "1.1"),  # For SSD
+        ("effective_io_concurrency", "200"),
+        ("work_mem", "2621kB"),
+        ("min_wal_size", "1GB"),
+        ("max_wal_size", "4GB"),
+        ("max_worker_processes", "2"),
+        ("max_parallel_workers_per_gather", "1"),
+        ("max_parallel_workers", "2"),
+    )
+
     def __init__(self, resource_group: str = "SecureWaveRG"):
         self.resource_group = resource_group
         self.server_name = "securewave-db"
@@ -34,19 +78,35 @@ class AzureDatabaseDeployer:
         self.geo_redundant_backup = True
         self.location = "eastus"
         self.version = "14"  # PostgreSQL 14
+        self.max_concurrent_az_commands = 8  # Stay under ARM request throttling
+
+        # Resolve the CLI and its environment once, not per command
+        self._az_path = shutil.which("az") or "az"
+        self._az_env = {**AZ_CLI_ENV, **os.environ}
+        self._current_ip: Optional[str] = None
+        self._arm_credentials: Optional[Tuple[str, str]] = None
+        # psycopg2 pools keyed by connection string, reused across test_connection
+        # calls until close_pools()
+        self._connection_pools: Dict = {}
 
     def generate_strong_password(self, length: int = 32) -> str:
         """Generate cryptographically strong password"""
-        alphabet = string.ascii_letters + string.digits + "!@#$%^&*"
-        password = ''.join(secrets.choice(alphabet) for _ in range(length))
-        # Ensure it meets Azure requirements
-        if not any(c.isupper() for c in password):
-            password = password[:length-1] + 'A'
-        if not any(c.islower() for c in password):
-            password = password[:length-2] + 'a' + password[-1]
-        if not any(c.isdigit() for c in password):
-            password = password[:length-3] + '1' + password[-2:]
-        return password
+        alphabet = (string.ascii_letters + string.digits + "!@#$%^&*").encode()
+        # Reject bytes past the last full multiple of the alphabet size so the
+        # modulo mapping stays unbiased
+        limit = 256 - (256 % len(alphabet))
+        chars = bytearray()
+        while len(chars) < length:
+            chars.extend(alphabet[b % len(alphabet)] for b in secrets.token_bytes(length * 2) if b < limit)
+        chars = chars[:length]
+
+        # Ensure it meets Azure requirements, using distinct positions so one
+        # character class can never overwrite another
+        rng = secrets.SystemRandom()
+        required = (string.ascii_uppercase, string.ascii_lowercase, string.digits)
+        for position, charset in zip(rng.sample(range(length), len(required)), required):
+            chars[position] = ord(rng.choice(charset))
+        return chars.decode()
 
     def deploy_postgresql_server(self) -> Dict:
         """
@@ -72,7 +132,7 @@ class AzureDatabaseDeployer:
         logger.info(f"Geo-Redundant Backup: {self.geo_redundant_backup}")
 
         # Create resource group if needed
-        logger.info("\n[1/6] Creating resource group...")
+        logger.info("\n[1/5] Creating resource group...")
         self._run_az_command([
             "group", "create",
             "--name", self.resource_group,
@@ -80,110 +140,8 @@ class AzureDatabaseDeployer:
         ])
         logger.info("✓ Resource group ready")
 
-        # Create PostgreSQL server
-        logger.info("\n[2/6] Creating PostgreSQL Flexible Server (this takes 3-5 minutes)...")
-        server_result = self._run_az_command([
-            "postgres", "flexible-server", "create",
-            "--resource-group", self.resource_group,
-            "--name", self.server_name,
-            "--location", self.location,
-            "--admin-user", self.admin_username,
-            "--admin-password", admin_password,
-            "--version", self.version,
-            "--sku-name", self.sku,
-            "--storage-size", str(self.storage_mb),
-            "--backup-retention", str(self.backup_retention_days),
-            "--geo-redundant-backup", "Enabled" if self.geo_redundant_backup else "Disabled",
-            "--high-availability", "ZoneRedundant",  # Zone-redundant HA
-            "--public-access", "0.0.0.0-255.255.255.255",  # Allow all (configure firewall rules separately)
-            "--tier", "GeneralPurpose"
-        ])
-        logger.info("✓ PostgreSQL server created")
-
-        # Get server details
-        logger.info("\n[3/6] Retrieving server details...")
-        server_info = json.loads(self._run_az_command([
-            "postgres", "flexible-server", "show",
-            "--resource-group", self.resource_group,
-            "--name", self.server_name,
-            "--output", "json"
-        ]))
-
-        hostname = server_info.get("fullyQualifiedDomainName", f"{self.server_name}.postgres.database.azure.com")
-        logger.info(f"✓ Server FQDN: {hostname}")
-
-        # Create application database
-        logger.info("\n[4/6] Creating application database...")
-        self._run_az_command([
-            "postgres", "flexible-server", "db", "create",
-            "--resource-group", self.resource_group,
-            "--server-name", self.server_name,
-            "--database-name", self.database_name
-        ])
-        logger.info(f"✓ Database '{self.database_name}' created")
-
-        # Configure firewall rules
-        logger.info("\n[5/6] Configuring firewall rules...")
-
-        # Allow Azure services
-        self._run_az_command([
-            "postgres", "flexible-server", "firewall-rule", "create",
-            "--resource-group", self.resource_group,
-            "--name", self.server_name,
-            "--rule-name", "AllowAzureServices",
-            "--start-ip-address", "0.0.0.0",
-            "--end-ip-address", "0.0.0.0"
-        ])
-
-        # Allow current IP
-        try:
-            current_ip = self._get_current_ip()
-            self._run_az_command([
-                "postgres", "flexible-server", "firewall-rule", "create",
-                "--resource-group", self.resource_group,
-                "--name", self.server_name,
-                "--rule-name", "AllowCurrentIP",
-                "--start-ip-address", current_ip,
-                "--end-ip-address", current_ip
-            ])
-            logger.info(f"✓ Firewall rules configured (allowed: Azure services, {current_ip})")
-        except:
-            logger.warning("Could not determine current IP, configure firewall manually")
-
-        # Configure server parameters for optimal performance
-        logger.info("\n[6/6] Optimizing server parameters...")
-
-        server_params = {
-            "max_connections": "200",
-            "shared_buffers": "524288",  # 512MB in 8KB pages
-            "effective_cache_size": "1572864",  # 1.5GB in 8KB pages
-            "maintenance_work_mem": "131072",  # 128MB in KB
-            "checkpoint_completion_target": "0.9",
-            "wal_buffers": "2048",  # 16MB in 8KB pages
-            "default_statistics_target": "100",
-            "random_page_cost": "1.1",  # For SSD
-            "effective_io_concurrency": "200",
-            "work_mem": "2621kB",
-            "min_wal_size": "1GB",
-            "max_wal_size": "4GB",
-            "max_worker_processes": "2",
-            "max_parallel_workers_per_gather": "1",
-            "max_parallel_workers": "2",
-        }
-
-        for param, value in server_params.items():
-            try:
-                self._run_az_command([
-                    "postgres", "flexible-server", "parameter", "set",
-                    "--resource-group", self.resource_group,
-                    "--server-name", self.server_name,
-                    "--name", param,
-                    "--value", value
-                ])
-            except:
-                logger.warning(f"Could not set parameter {param}")
-
-        logger.info("✓ Server parameters optimized")
+        import asyncio
+        hostname = asyncio.run(self._provision_server_async(admin_password))
 
         # Generate connection strings
         connection_details = {
@@ -197,8 +155,7 @@ class AzureDatabaseDeployer:
             "deployment_time": datetime.utcnow().isoformat(),
 
             # Connection strings
-            "connection_string": f"postgresql://{self.admin_username}:{admin_password}@{hostname}:5432/{self.database_name}?sslmode=require",
-            "sqlalchemy_url": f"postgresql+psycopg2://{self.admin_username}:{admin_password}@{hostname}:5432/{self.database_name}",
+            **self._build_connection_strings(hostname, admin_password),
             "django_settings": {
                 "ENGINE": "django.db.backends.postgresql",
                 "NAME": self.database_name,
@@ -233,6 +190,237 @@ class AzureDatabaseDeployer:
 
         return connection_details
 
+    async def _provision_server_async(self, admin_password: str) -> str:
+        """
+        Create the PostgreSQL server and configure it
+
+        Local preparation (the public IP lookup used for the firewall rule and
+        the ARM access token) runs while Azure provisions the server, instead
+        of after it.
+
+        Returns:
+            Server hostname
+        """
+        import asyncio
+
+        # Create PostgreSQL server
+        logger.info("\n[2/5] Creating PostgreSQL Flexible Server (this takes 3-5 minutes)...")
+        create_server = asyncio.create_task(self._run_az_json_async([
+            "postgres", "flexible-server", "create",
+            "--resource-group", self.resource_group,
+            "--name", self.server_name,
+            "--location", self.location,
+            "--admin-user", self.admin_username,
+            "--admin-password", admin_password,
+            "--version", self.version,
+            "--sku-name", self.sku,
+            "--storage-size", str(self.storage_mb),
+            "--backup-retention", str(self.backup_retention_days),
+            "--geo-redundant-backup", "Enabled" if self.geo_redundant_backup else "Disabled",
+            "--high-availability", "ZoneRedundant",  # Zone-redundant HA
+            "--public-access", "0.0.0.0-255.255.255.255",  # Allow all (configure firewall rules separately)
+            "--tier", "GeneralPurpose"
+        ]))
+
+        async def prefetch_current_ip():
+            # Warms the _get_current_ip cache; failures are reported by the firewall step
+            try:
+                await asyncio.to_thread(self._get_current_ip)
+            except OSError:
+                pass
+
+        server_info, _, _ = await asyncio.gather(
+            create_server,
+            prefetch_current_ip(),
+            self._get_arm_credentials_async()
+        )
+        logger.info("✓ PostgreSQL server created")
+
+        # The create response already carries the server host, no separate show needed
+        hostname = (
+            server_info.get("host")
+            or server_info.get("fullyQualifiedDomainName")
+            or f"{self.server_name}.postgres.database.azure.com"
+        )
+        logger.info(f"✓ Server FQDN: {hostname}")
+
+        # Database, firewall rules and parameters only depend on the server
+        # existing, so configure them concurrently
+        logger.info("\n[3/5] Creating application database...")
+        logger.info("[4/5] Configuring firewall rules...")
+        logger.info("[5/5] Optimizing server parameters...")
+        await self._configure_server_async()
+        logger.info("✓ Server parameters optimized")
+
+        return hostname
+
+    async def _configure_server_async(self):
+        """Create the application database, firewall rules and server parameters concurrently"""
+        import asyncio
+        import subprocess
+        import time
+        import httpx
+
+        semaphore = asyncio.Semaphore(self.max_concurrent_az_commands)
+
+        async def run(args: list):
+            async with semaphore:
+                await self._run_az_command_async(args)
+
+        async def create_database():
+            await run([
+                "postgres", "flexible-server", "db", "create",
+                "--resource-group", self.resource_group,
+                "--server-name", self.server_name,
+                "--database-name", self.database_name
+            ])
+            logger.info(f"✓ Database '{self.database_name}' created")
+
+        async def ensure_firewall_rule(rule_name: str, start_ip: str, end_ip: str):
+            # PUT creates or replaces the rule, so reruns are safe
+            await self._arm_put_async(client, f"firewallRules/{rule_name}", {
+                "properties": {"startIpAddress": start_ip, "endIpAddress": end_ip}
+            })
+
+        async def configure_firewall():
+            # Allow Azure services
+            await ensure_firewall_rule("AllowAzureServices", "0.0.0.0", "0.0.0.0")
+
+            # Allow current IP
+            try:
+                current_ip = await asyncio.to_thread(self._get_current_ip)
+            except OSError:
+                logger.warning("Could not determine current IP, configure firewall manually")
+                return
+
+            await ensure_firewall_rule("AllowCurrentIP", current_ip, current_ip)
+            logger.info(f"✓ Firewall rules configured (allowed: Azure services, {current_ip})")
+
+        async def set_parameter(param: str, value: str, timeout: float):
+            try:
+                await self._arm_put_async(client, f"configurations/{param}", {
+                    "properties": {"value": value, "source": "user-override"}
+                }, timeout=timeout)
+            except (httpx.HTTPError, RuntimeError, TimeoutError):
+                logger.warning(f"Could not set parameter {param}")
+
+        async def set_parameters():
+            # One ARM request for all parameters; older CLIs without set-batch
+            # (or a rejected value) fall back to individual updates
+            try:
+                await run([
+                    "postgres", "flexible-server", "parameter", "set-batch",
+                    "--resource-group", self.resource_group,
+                    "--server-name", self.server_name,
+                    "--source", "user-override",
+                    "--batch-parameters",
+                    *[f"{param}={value}" for param, value in self.SERVER_PARAMETERS]
+                ])
+            except subprocess.CalledProcessError:
+                logger.warning("Batch parameter update failed, setting parameters individually")
+                # In SERVER_PARAMETERS order; the server applies one update at
+                # a time anyway, so concurrent PUTs would only collect 409s.
+                # The whole fallback shares one 10 minute deadline.
+                deadline = time.monotonic() + 600
+                for param, value in self.SERVER_PARAMETERS:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        logger.warning(f"Could not set parameter {param}: fallback deadline passed")
+                        continue
+                    await set_parameter(param, value, remaining)
+
+        # Firewall rules and parameter fallbacks go straight to ARM over one
+        # keep-alive connection pool (HTTP/2 when h2 is installed)
+        try:
+            import h2  # noqa: F401
+            http2 = True
+        except ImportError:
+            http2 = False
+
+        limits = httpx.Limits(max_connections=self.max_concurrent_az_commands)
+        async with httpx.AsyncClient(http2=http2, limits=limits, timeout=60) as client:
+            await asyncio.gather(
+                create_database(),
+                configure_firewall(),
+                set_parameters()
+            )
+
+    async def _get_arm_credentials_async(self) -> Tuple[str, str]:
+        """Fetch an ARM bearer token and subscription ID once and reuse them"""
+        if self._arm_credentials is None:
+            token = await self._run_az_json_async([
+                "account", "get-access-token",
+                "--resource", ARM_ENDPOINT
+            ])
+            self._arm_credentials = (token["accessToken"], token["subscription"])
+        return self._arm_credentials
+
+    async def _arm_put_async(self, client, path: str, body: Dict, max_attempts: int = 5,
+                             timeout: float = 600):
+        """
+        PUT a child resource of the server through ARM and wait for it to apply
+
+        Args:
+            client: httpx.AsyncClient to send the request with
+            path: Resource path relative to the server, e.g. "configurations/work_mem"
+            body: Request body
+            max_attempts: Attempts while the server is busy or requests are throttled
+            timeout: Seconds to wait for the update to apply before raising TimeoutError
+        """
+        import asyncio
+        import time
+
+        deadline = time.monotonic() + timeout
+
+        token, subscription = await self._get_arm_credentials_async()
+        url = (
+            f"{ARM_ENDPOINT}/subscriptions/{subscription}/resourceGroups/{self.resource_group}"
+            f"/providers/Microsoft.DBforPostgreSQL/flexibleServers/{self.server_name}/{path}"
+        )
+        headers = {"Authorization": f"Bearer {token}"}
+
+        for attempt in range(1, max_attempts + 1):
+            response = await client.put(
+                url, params={"api-version": ARM_POSTGRES_API_VERSION}, headers=headers, json=body
+            )
+            # The server accepts one update at a time; back off on conflicts and throttling
+            if response.status_code not in (409, 429) or attempt == max_attempts:
+                break
+            await asyncio.sleep(float(response.headers.get("Retry-After", 2 ** attempt)))
+        response.raise_for_status()
+
+        # Long-running operation: poll until ARM reports a terminal state
+        status_url = response.headers.get("Azure-AsyncOperation")
+        if response.status_code != 202 or not status_url:
+            return
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise TimeoutError(f"ARM update of {path} did not finish within {timeout:g}s")
+            await asyncio.sleep(min(float(response.headers.get("Retry-After", 5)), remaining))
+            response = await client.get(status_url, headers=headers)
+            response.raise_for_status()
+            status = response.json().get("status")
+            if status == "Succeeded":
+                return
+            if status in ("Failed", "Canceled"):
+                raise RuntimeError(f"ARM update of {path} {status.lower()}")
+
+    def _build_connection_strings(self, hostname: str, password: str) -> Dict[str, str]:
+        """
+        Build connection URLs for a server
+
+        The password is percent-encoded: generated passwords contain URL
+        delimiters such as '@', '#' and '%' that would otherwise corrupt the URL.
+        """
+        from urllib.parse import quote_plus
+
+        credentials = f"{quote_plus(self.admin_username)}:{quote_plus(password)}"
+        return {
+            "connection_string": f"postgresql://{credentials}@{hostname}:5432/{self.database_name}?sslmode=require",
+            "sqlalchemy_url": f"postgresql+psycopg2://{credentials}@{hostname}:5432/{self.database_name}",
+        }
+
     def create_read_replica(self, replica_name: str, location: str = "westus2") -> Dict:
         """
         Create read replica for load balancing and disaster recovery
@@ -255,12 +443,11 @@ class AzureDatabaseDeployer:
         ])
 
         # Get replica details
-        replica_info = json.loads(self._run_az_command([
+        replica_info = self._run_az_json([
             "postgres", "flexible-server", "show",
             "--resource-group", self.resource_group,
-            "--name", replica_name,
-            "--output", "json"
-        ]))
+            "--name", replica_name
+        ])
 
         replica_hostname = replica_info.get("fullyQualifiedDomainName")
 
@@ -315,18 +502,36 @@ class AzureDatabaseDeployer:
     def test_connection(self, connection_string: str) -> bool:
         """Test database connection"""
         try:
-            import psycopg2
-            conn = psycopg2.connect(connection_string)
-            cursor = conn.cursor()
-            cursor.execute("SELECT version();")
-            version = cursor.fetchone()
+            pool = self._get_connection_pool(connection_string)
+            conn = pool.getconn()
+            try:
+                cursor = conn.cursor()
+                cursor.execute("SELECT version();")
+                version = cursor.fetchone()
+                cursor.close()
+            finally:
+                pool.putconn(conn)
             logger.info(f"✓ Connection successful: {version[0]}")
-            conn.close()
             return True
         except Exception as e:
             logger.error(f"✗ Connection failed: {e}")
             return False
 
+    def _get_connection_pool(self, connection_string: str):
+        """Get (or create) the psycopg2 pool for a connection string"""
+        pool = self._connection_pools.get(connection_string)
+        if pool is None:
+            from psycopg2.pool import ThreadedConnectionPool
+            pool = ThreadedConnectionPool(1, 20, connection_string)
+            self._connection_pools[connection_string] = pool
+        return pool
+
+    def close_pools(self):
+        """Close every connection pool opened by test_connection"""
+        for pool in self._connection_pools.values():
+            pool.closeall()
+        self._connection_pools.clear()
+
     def _save_credentials(self, details: Dict):
         """Save database credentials to .env.production file"""
         env_file = ".env.production"
@@ -355,35 +560,84 @@ DB_BACKUP_RETENTION_DAYS={self.backup_retention_days}
 DB_GEO_REDUNDANT_BACKUP={str(self.geo_redundant_backup).lower()}
 """
 
-        with open(env_file, 'w') as f:
-            f.write(env_content)
-
-        # Set restrictive permissions
-        os.chmod(env_file, 0o600)
+        # Owner-only permissions from creation, so credentials are never readable by others
+        write_private_file(env_file, env_content.encode())
 
         logger.info(f"✓ Credentials saved to {env_file}")
 
     def _get_current_ip(self) -> str:
-        """Get current public IP address"""
-        import requests
-        return requests.get('https://api.ipify.org').text
+        """Get current public IP address (looked up once per deployer)"""
+        if self._current_ip is None:
+            from urllib.request import urlopen
+            with urlopen("https://api.ipify.org", timeout=3) as response:
+                self._current_ip = response.read().decode().strip()
+        return self._current_ip
+
+    def _run_az_command(self, args: list, capture: bool = False) -> Optional[str]:
+        """
+        Execute Azure CLI command
 
-    def _run_az_command(self, args: list) -> str:
-        """Execute Azure CLI command"""
-        cmd = ["az"] + args
+        stdout is only kept when capture=True; otherwise it is discarded and
+        None is returned. stderr is always captured for error reporting.
+        """
+        stdout = self._run_az_command_bytes(args, capture=capture)
+        return stdout.decode("utf-8", "replace") if stdout is not None else None
+
+    def _run_az_json(self, args: list):
+        """Execute Azure CLI command and parse its JSON output"""
+        stdout = self._run_az_command_bytes(args + ["--output", "json"], capture=True)
+        return loads_json(stdout)
+
+    def _run_az_command_bytes(self, args: list, capture: bool = False) -> Optional[bytes]:
+        """Execute Azure CLI command and return raw stdout, skipping text decoding"""
+        import subprocess
+
+        cmd = [self._az_path] + args
         try:
             result = subprocess.run(
                 cmd,
-                capture_output=True,
-                text=True,
-                check=True
+                stdout=subprocess.PIPE if capture else subprocess.DEVNULL,
+                stderr=subprocess.PIPE,
+                check=True,
+                env=self._az_env
             )
             return result.stdout
         except subprocess.CalledProcessError as e:
             logger.error(f"Azure CLI command failed: {' '.join(cmd)}")
-            logger.error(f"Error: {e.stderr}")
+            logger.error(f"Error: {e.stderr.decode('utf-8', 'replace')}")
             raise
 
+    async def _run_az_command_async(self, args: list, capture: bool = False) -> Optional[str]:
+        """Execute Azure CLI command without blocking the event loop"""
+        stdout = await self._run_az_command_bytes_async(args, capture=capture)
+        return stdout.decode("utf-8", "replace") if stdout is not None else None
+
+    async def _run_az_json_async(self, args: list):
+        """Execute Azure CLI command without blocking and parse its JSON output"""
+        stdout = await self._run_az_command_bytes_async(args + ["--output", "json"], capture=True)
+        return loads_json(stdout)
+
+    async def _run_az_command_bytes_async(self, args: list, capture: bool = False) -> Optional[bytes]:
+        """Execute Azure CLI command without blocking and return raw stdout"""
+        import asyncio
+        import subprocess
+
+        cmd = [self._az_path] + args
+        process = await asyncio.create_subprocess_exec(
+            *cmd,
+            stdout=asyncio.subprocess.PIPE if capture else asyncio.subprocess.DEVNULL,
+            stderr=asyncio.subprocess.PIPE,
+            env=self._az_env
+        )
+        stdout, stderr = await process.communicate()
+
+        if process.returncode != 0:
+            logger.error(f"Azure CLI command failed: {' '.join(cmd)}")
+            logger.error(f"Error: {stderr.decode('utf-8', 'replace')}")
+            raise subprocess.CalledProcessError(process.returncode, cmd, output=stdout, stderr=stderr)
+
+        return stdout if capture else None
+
 
 def deploy_database():
     """Main deployment function"""
@@ -393,8 +647,7 @@ def deploy_database():
     connection_details = deployer.deploy_postgresql_server()
 
     # Save deployment info
-    with open("database_deployment.json", "w") as f:
-        json.dump(connection_details, f, indent=2)
+    write_private_file("database_deployment.json", dump_json(connection_details))
 
     print("\n✓ Deployment details saved to database_deployment.json")
 
@@ -405,6 +658,8 @@ def deploy_database():
     except ImportError:
         print("⚠ psycopg2 not installed, skipping connection test")
         print("  Install with: pip install psycopg2-binary")
+    finally:
+        deployer.close_pools()
 
     return connection_details
 
@@ -429,8 +684,7 @@ def deploy_with_replica():
         "deployment_time": datetime.utcnow().isoformat()
     }
 
-    with open("database_deployment_ha.json", "w") as f:
-        json.dump(deployment, f, indent=2)
+    write_private_file("database_deployment_ha.json", dump_json(deployment))
 
     print("\n✓ High-availability deployment complete")
     print(f"✓ Primary: {primary_details['hostname']}")
@@ -454,7 +708,10 @@ if __name__ == "__main__":
             with open("database_deployment.json", "r") as f:
                 details = json.load(f)
             deployer = AzureDatabaseDeployer()
-            deployer.test_connection(details['connection_string'])
+            try:
+                deployer.test_connection(details['connection_string'])
+            finally:
+                deployer.close_pools()
         except FileNotFoundError:
             print("No deployment found. Run without --test first.")
     elif args.replica:
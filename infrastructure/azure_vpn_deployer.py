@@ -7,87 +7,227 @@ Automated deployment and management of WireGuard VPN servers across Azure region
 import os
 import sys
 import json
-import subprocess
-import secrets
+import shutil
 import base64
-from typing import Dict, List, Optional, Tuple
+import string
+import time
+from array import array
+from functools import lru_cache
+from types import MappingProxyType
+from typing import TYPE_CHECKING, AsyncIterator, Dict, List, Mapping, NamedTuple, Optional, Tuple
 from datetime import datetime
+from pathlib import Path
 import logging
 
+# httpx, cryptography, asyncio and subprocess are imported where they are
+# used, so printing usage or importing the region table stays fast
+if TYPE_CHECKING:
+    import httpx
+
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from utils.file_utils import write_private_file  # noqa: E402
+from utils.json_utils import dump_json, loads_json  # noqa: E402
+
+# Azure CLI settings for the remaining `az` invocation (the ARM token):
+# skip the telemetry upload, survey prompt and on-demand extension install
+# that would otherwise run in the freshly started CLI process
+AZ_CLI_ENV = {
+    "AZURE_CORE_COLLECT_TELEMETRY": "false",
+    "AZURE_CORE_SURVEY_MESSAGE": "false",
+    "AZURE_CORE_NO_COLOR": "true",
+    "AZURE_CORE_ONLY_SHOW_ERRORS": "true",
+    "AZURE_EXTENSION_USE_DYNAMIC_INSTALL": "no",
+}
+
+# Azure Resource Manager endpoint and API versions for the resources that
+# are managed directly instead of through one `az` process per call
+ARM_ENDPOINT = "https://management.azure.com"
+RESOURCES_API_VERSION = "2021-04-01"
+NETWORK_API_VERSION = "2023-05-01"
+COMPUTE_API_VERSION = "2023-03-01"
+SUBSCRIPTIONS_API_VERSION = "2022-12-01"
+
+# Regions the subscription can deploy to, as reported by ARM, cached on disk
+REGIONS_CACHE_PATH = os.path.expanduser("~/.securewave/regions.json")
+REGIONS_CACHE_TTL_SECONDS = 7 * 24 * 3600
+
+
+class Region(NamedTuple):
+    """Location details for an Azure region"""
+    city: str
+    country: str
+    country_code: str
+    region: str  # Continent grouping used for fleet deployment
+    lat: float
+    lon: float
+
+
+# 50+ Azure regions with detailed location information
+AZURE_REGIONS: Mapping[str, Region] = MappingProxyType({
+    # North America
+    "eastus": Region("Virginia", "United States", "US", "Americas", 37.3719, -79.8164),
+    "eastus2": Region("Virginia", "United States", "US", "Americas", 36.6681, -78.3889),
+    "centralus": Region("Iowa", "United States", "US", "Americas", 41.5908, -93.6208),
+    "northcentralus": Region("Illinois", "United States", "US", "Americas", 41.8819, -87.6278),
+    "southcentralus": Region("Texas", "United States", "US", "Americas", 29.4167, -98.5),
+    "westcentralus": Region("Wyoming", "United States", "US", "Americas", 40.89, -110.2347),
+    "westus": Region("California", "United States", "US", "Americas", 37.783, -122.417),
+    "westus2": Region("Washington", "United States", "US", "Americas", 47.233, -119.852),
+    "westus3": Region("Arizona", "United States", "US", "Americas", 33.448, -112.074),
+    "canadacentral": Region("Toronto", "Canada", "CA", "Americas", 43.653, -79.383),
+    "canadaeast": Region("Quebec", "Canada", "CA", "Americas", 46.817, -71.217),
+
+    # Europe
+    "northeurope": Region("Ireland", "Ireland", "IE", "Europe", 53.3478, -6.2597),
+    "westeurope": Region("Netherlands", "Netherlands", "NL", "Europe", 52.3667, 4.8945),
+    "uksouth": Region("London", "United Kingdom", "GB", "Europe", 51.5074, -0.1278),
+    "ukwest": Region("Cardiff", "United Kingdom", "GB", "Europe", 51.4816, -3.1791),
+    "francecentral": Region("Paris", "France", "FR", "Europe", 48.8566, 2.3522),
+    "francesouth": Region("Marseille", "France", "FR", "Europe", 43.2965, 5.3698),
+    "germanywestcentral": Region("Frankfurt", "Germany", "DE", "Europe", 50.1109, 8.6821),
+    "germanynorth": Region("Berlin", "Germany", "DE", "Europe", 52.52, 13.405),
+    "norwayeast": Region("Oslo", "Norway", "NO", "Europe", 59.9139, 10.7522),
+    "norwaywest": Region("Stavanger", "Norway", "NO", "Europe", 58.9701, 5.7331),
+    "switzerlandnorth": Region("Zurich", "Switzerland", "CH", "Europe", 47.3769, 8.5417),
+    "switzerlandwest": Region("Geneva", "Switzerland", "CH", "Europe", 46.2044, 6.1432),
+    "swedencentral": Region("Stockholm", "Sweden", "SE", "Europe", 59.3293, 18.0686),
+    "polandcentral": Region("Warsaw", "Poland", "PL", "Europe", 52.2297, 21.0122),
+    "italynorth": Region("Milan", "Italy", "IT", "Europe", 45.4642, 9.19),
+    "spaincentral": Region("Madrid", "Spain", "ES", "Europe", 40.4168, -3.7038),
+
+    # Asia Pacific
+    "eastasia": Region("Hong Kong", "Hong Kong", "HK", "Asia", 22.3964, 114.1095),
+    "southeastasia": Region("Singapore", "Singapore", "SG", "Asia", 1.3521, 103.8198),
+    "japaneast": Region("Tokyo", "Japan", "JP", "Asia", 35.6895, 139.6917),
+    "japanwest": Region("Osaka", "Japan", "JP", "Asia", 34.6937, 135.5023),
+    "australiaeast": Region("Sydney", "Australia", "AU", "Asia", -33.8688, 151.2093),
+    "australiasoutheast": Region("Melbourne", "Australia", "AU", "Asia", -37.8136, 144.9631),
+    "australiacentral": Region("Canberra", "Australia", "AU", "Asia", -35.2809, 149.13),
+    "koreacentral": Region("Seoul", "South Korea", "KR", "Asia", 37.5665, 126.978),
+    "koreasouth": Region("Busan", "South Korea", "KR", "Asia", 35.1796, 129.0756),
+    "indiacentral": Region("Pune", "India", "IN", "Asia", 18.5204, 73.8567),
+    "indiasouth": Region("Chennai", "India", "IN", "Asia", 13.0827, 80.2707),
+    "indiawest": Region("Mumbai", "India", "IN", "Asia", 19.076, 72.8777),
+    "jioindiawest": Region("Jamnagar", "India", "IN", "Asia", 22.4707, 70.0577),
+    "jioindiacentral": Region("Nagpur", "India", "IN", "Asia", 21.1458, 79.0882),
+
+    # Middle East & Africa
+    "uaenorth": Region("Dubai", "United Arab Emirates", "AE", "Middle East", 25.2048, 55.2708),
+    "uaecentral": Region("Abu Dhabi", "United Arab Emirates", "AE", "Middle East", 24.4539, 54.3773),
+    "southafricanorth": Region("Johannesburg", "South Africa", "ZA", "Africa", -26.2041, 28.0473),
+    "southafricawest": Region("Cape Town", "South Africa", "ZA", "Africa", -33.9249, 18.4241),
+    "qatarcentral": Region("Doha", "Qatar", "QA", "Middle East", 25.2854, 51.531),
+    "israelcentral": Region("Tel Aviv", "Israel", "IL", "Middle East", 32.0853, 34.7818),
+
+    # South America
+    "brazilsouth": Region("Sao Paulo", "Brazil", "BR", "Americas", -23.5505, -46.6333),
+    "brazilsoutheast": Region("Rio de Janeiro", "Brazil", "BR", "Americas", -22.9068, -43.1729),
+
+    # China (requires special subscription)
+    "chinanorth": Region("Beijing", "China", "CN", "Asia", 39.9042, 116.4074),
+    "chinanorth2": Region("Beijing", "China", "CN", "Asia", 40.1824, 116.4142),
+    "chinaeast": Region("Shanghai", "China", "CN", "Asia", 31.2304, 121.4737),
+    "chinaeast2": Region("Shanghai", "China", "CN", "Asia", 31.1774, 121.5509),
+})
+
+
+# Column-oriented view of AZURE_REGIONS for vectorized geo lookups: the
+# coordinate arrays are contiguous float32 buffers aligned with REGION_NAMES,
+# so numpy.frombuffer(REGION_LATITUDES, dtype=numpy.float32) is zero-copy
+REGION_NAMES: Tuple[str, ...] = tuple(AZURE_REGIONS)
+REGION_LATITUDES = array("f", (info.lat for info in AZURE_REGIONS.values()))
+REGION_LONGITUDES = array("f", (info.lon for info in AZURE_REGIONS.values()))
+
 
 class AzureVPNDeployer:
     """Manages VPN server deployment and provisioning on Azure"""
 
-    # 50+ Azure regions with detailed location information
-    AZURE_REGIONS = {
-        # North America
-        "eastus": {"city": "Virginia", "country": "United States", "country_code": "US", "region": "Americas", "lat": 37.3719, "lon": -79.8164},
-        "eastus2": {"city": "Virginia", "country": "United States", "country_code": "US", "region": "Americas", "lat": 36.6681, "lon": -78.3889},
-        "centralus": {"city": "Iowa", "country": "United States", "country_code": "US", "region": "Americas", "lat": 41.5908, "lon": -93.6208},
-        "northcentralus": {"city": "Illinois", "country": "United States", "country_code": "US", "region": "Americas", "lat": 41.8819, "lon": -87.6278},
-        "southcentralus": {"city": "Texas", "country": "United States", "country_code": "US", "region": "Americas", "lat": 29.4167, "lon": -98.5},
-        "westcentralus": {"city": "Wyoming", "country": "United States", "country_code": "US", "region": "Americas", "lat": 40.89, "lon": -110.2347},
-        "westus": {"city": "California", "country": "United States", "country_code": "US", "region": "Americas", "lat": 37.783, "lon": -122.417},
-        "westus2": {"city": "Washington", "country": "United States", "country_code": "US", "region": "Americas", "lat": 47.233, "lon": -119.852},
-        "westus3": {"city": "Arizona", "country": "United States", "country_code": "US", "region": "Americas", "lat": 33.448, "lon": -112.074},
-        "canadacentral": {"city": "Toronto", "country": "Canada", "country_code": "CA", "region": "Americas", "lat": 43.653, "lon": -79.383},
-        "canadaeast": {"city": "Quebec", "country": "Canada", "country_code": "CA", "region": "Americas", "lat": 46.817, "lon": -71.217},
-
-        # Europe
-        "northeurope": {"city": "Ireland", "country": "Ireland", "country_code": "IE", "region": "Europe", "lat": 53.3478, "lon": -6.2597},
-        "westeurope": {"city": "Netherlands", "country": "Netherlands", "country_code": "NL", "region": "Europe", "lat": 52.3667, "lon": 4.8945},
-        "uksouth": {"city": "London", "country": "United Kingdom", "country_code": "GB", "region": "Europe", "lat": 51.5074, "lon": -0.1278},
-        "ukwest": {"city": "Cardiff", "country": "United Kingdom", "country_code": "GB", "region": "Europe", "lat": 51.4816, "lon": -3.1791},
-        "francecentral": {"city": "Paris", "country": "France", "country_code": "FR", "region": "Europe", "lat": 48.8566, "lon": 2.3522},
-        "francesouth": {"city": "Marseille", "country": "France", "country_code": "FR", "region": "Europe", "lat": 43.2965, "lon": 5.3698},
-        "germanywestcentral": {"city": "Frankfurt", "country": "Germany", "country_code": "DE", "region": "Europe", "lat": 50.1109, "lon": 8.6821},
-        "germanynorth": {"city": "Berlin", "country": "Germany", "country_code": "DE", "region": "Europe", "lat": 52.52, "lon": 13.405},
-        "norwayeast": {"city": "Oslo", "country": "Norway", "country_code": "NO", "region": "Europe", "lat": 59.9139, "lon": 10.7522},
-        "norwaywest": {"city": "Stavanger", "country": "Norway", "country_code": "NO", "region": "Europe", "lat": 58.9701, "lon": 5.7331},
-        "switzerlandnorth": {"city": "Zurich", "country": "Switzerland", "country_code": "CH", "region": "Europe", "lat": 47.3769, "lon": 8.5417},
-        "switzerlandwest": {"city": "Geneva", "country": "Switzerland", "country_code": "CH", "region": "Europe", "lat": 46.2044, "lon": 6.1432},
-        "swedencentral": {"city": "Stockholm", "country": "Sweden", "country_code": "SE", "region": "Europe", "lat": 59.3293, "lon": 18.0686},
-        "polandcentral": {"city": "Warsaw", "country": "Poland", "country_code": "PL", "region": "Europe", "lat": 52.2297, "lon": 21.0122},
-        "italynorth": {"city": "Milan", "country": "Italy", "country_code": "IT", "region": "Europe", "lat": 45.4642, "lon": 9.19},
-        "spaincentral": {"city": "Madrid", "country": "Spain", "country_code": "ES", "region": "Europe", "lat": 40.4168, "lon": -3.7038},
-
-        # Asia Pacific
-        "eastasia": {"city": "Hong Kong", "country": "Hong Kong", "country_code": "HK", "region": "Asia", "lat": 22.3964, "lon": 114.1095},
-        "southeastasia": {"city": "Singapore", "country": "Singapore", "country_code": "SG", "region": "Asia", "lat": 1.3521, "lon": 103.8198},
-        "japaneast": {"city": "Tokyo", "country": "Japan", "country_code": "JP", "region": "Asia", "lat": 35.6895, "lon": 139.6917},
-        "japanwest": {"city": "Osaka", "country": "Japan", "country_code": "JP", "region": "Asia", "lat": 34.6937, "lon": 135.5023},
-        "australiaeast": {"city": "Sydney", "country": "Australia", "country_code": "AU", "region": "Asia", "lat": -33.8688, "lon": 151.2093},
-        "australiasoutheast": {"city": "Melbourne", "country": "Australia", "country_code": "AU", "region": "Asia", "lat": -37.8136, "lon": 144.9631},
-        "australiacentral": {"city": "Canberra", "country": "Australia", "country_code": "AU", "region": "Asia", "lat": -35.2809, "lon": 149.13},
-        "koreacentral": {"city": "Seoul", "country": "South Korea", "country_code": "KR", "region": "Asia", "lat": 37.5665, "lon": 126.978},
-        "koreasouth": {"city": "Busan", "country": "South Korea", "country_code": "KR", "region": "Asia", "lat": 35.1796, "lon": 129.0756},
-        "indiacentral": {"city": "Pune", "country": "India", "country_code": "IN", "region": "Asia", "lat": 18.5204, "lon": 73.8567},
-        "indiasouth": {"city": "Chennai", "country": "India", "country_code": "IN", "region": "Asia", "lat": 13.0827, "lon": 80.2707},
-        "indiawest": {"city": "Mumbai", "country": "India", "country_code": "IN", "region": "Asia", "lat": 19.076, "lon": 72.8777},
-        "jioindiawest": {"city": "Jamnagar", "country": "India", "country_code": "IN", "region": "Asia", "lat": 22.4707, "lon": 70.0577},
-        "jioindiacentral": {"city": "Nagpur", "country": "India", "country_code": "IN", "region": "Asia", "lat": 21.1458, "lon": 79.0882},
-
-        # Middle East & Africa
-        "uaenorth": {"city": "Dubai", "country": "United Arab Emirates", "country_code": "AE", "region": "Middle East", "lat": 25.2048, "lon": 55.2708},
-        "uaecentral": {"city": "Abu Dhabi", "country": "United Arab Emirates", "country_code": "AE", "region": "Middle East", "lat": 24.4539, "lon": 54.3773},
-        "southafricanorth": {"city": "Johannesburg", "country": "South Africa", "country_code": "ZA", "region": "Africa", "lat": -26.2041, "lon": 28.0473},
-        "southafricawest": {"city": "Cape Town", "country": "South Africa", "country_code": "ZA", "region": "Africa", "lat": -33.9249, "lon": 18.4241},
-        "qatarcentral": {"city": "Doha", "country": "Qatar", "country_code": "QA", "region": "Middle East", "lat": 25.2854, "lon": 51.531},
-        "israelcentral": {"city": "Tel Aviv", "country": "Israel", "country_code": "IL", "region": "Middle East", "lat": 32.0853, "lon": 34.7818},
-
-        # South America
-        "brazilsouth": {"city": "Sao Paulo", "country": "Brazil", "country_code": "BR", "region": "Americas", "lat": -23.5505, "lon": -46.6333},
-        "brazilsoutheast": {"city": "Rio de Janeiro", "country": "Brazil", "country_code": "BR", "region": "Americas", "lat": -22.9068, "lon": -43.1729},
-
-        # China (requires special subscription)
-        "chinanorth": {"city": "Beijing", "country": "China", "country_code": "CN", "region": "Asia", "lat": 39.9042, "lon": 116.4074},
-        "chinanorth2": {"city": "Beijing", "country": "China", "country_code": "CN", "region": "Asia", "lat": 40.1824, "lon": 116.4142},
-        "chinaeast": {"city": "Shanghai", "country": "China", "country_code": "CN", "region": "Asia", "lat": 31.2304, "lon": 121.4737},
-        "chinaeast2": {"city": "Shanghai", "country": "China", "country_code": "CN", "region": "Asia", "lat": 31.1774, "lon": 121.5509},
-    }
+    AZURE_REGIONS = AZURE_REGIONS
+
+    # cloud-init for WireGuard installation and configuration, rendered per
+    # server by _generate_cloud_init_config ($$ is a literal shell $)
+    _CLOUD_INIT_TEMPLATE = string.Template("""#cloud-config
+package_upgrade: true
+packages:
+  - wireguard
+  - qrencode
+  - iptables
+  - curl
+  - jq
+  - python3
+  - python3-pip
+
+write_files:
+  - path: /etc/sysctl.d/99-wireguard.conf
+    content: |
+      net.ipv4.ip_forward=1
+      net.ipv6.conf.all.forwarding=1
+    permissions: '0644'
+
+  - path: /etc/wireguard/wg0.conf
+    content: |
+      [Interface]
+      PrivateKey = ${private_key}
+      Address = 10.8.0.1/24
+      ListenPort = ${wg_port}
+      PostUp = iptables -A FORWARD -i wg0 -j ACCEPT; iptables -t nat -A POSTROUTING -o eth0 -j MASQUERADE
+      PostDown = iptables -D FORWARD -i wg0 -j ACCEPT; iptables -t nat -D POSTROUTING -o eth0 -j MASQUERADE
+    permissions: '0600'
+
+  - path: /usr/local/bin/vpn-health-check.sh
+    content: |
+      #!/bin/bash
+      # Health check script for monitoring
+      wg show wg0 > /dev/null 2>&1
+      echo $$?
+    permissions: '0755'
+
+  - path: /usr/local/bin/vpn-metrics.sh
+    content: |
+      #!/bin/bash
+      # Export metrics for monitoring system
+      echo "{"
+      echo "  \\"cpu_load\\": $$(awk '{print $$1}' /proc/loadavg),"
+      echo "  \\"memory_used\\": $$(free | grep Mem | awk '{printf \\"%.2f\\", $$3/$$2 * 100}'),"
+      echo "  \\"disk_used\\": $$(df / | tail -1 | awk '{print $$5}' | sed 's/%//'),"
+      echo "  \\"connections\\": $$(wg show wg0 | grep peer | wc -l),"
+      echo "  \\"timestamp\\": \\"$$(date -u +%Y-%m-%dT%H:%M:%SZ)\\""
+      echo "}"
+    permissions: '0755'
+
+runcmd:
+  - sysctl -p /etc/sysctl.d/99-wireguard.conf
+  - systemctl enable wg-quick@wg0
+  - systemctl start wg-quick@wg0
+  - ufw allow ${wg_port}/udp
+  - ufw allow 22/tcp
+  - echo "WireGuard VPN Server Ready" > /var/log/vpn-ready.log
+""")
+
+    @staticmethod
+    @lru_cache(maxsize=None)
+    def continent_of(azure_region: str) -> str:
+        """Return the continent grouping of an Azure region (e.g. 'Europe')"""
+        try:
+            return AZURE_REGIONS[azure_region].region
+        except KeyError:
+            raise ValueError(f"Unknown Azure region: {azure_region}") from None
+
+    @staticmethod
+    @lru_cache(maxsize=1)
+    def _by_continent() -> Mapping[str, Tuple[str, ...]]:
+        """Azure regions grouped by continent, in AZURE_REGIONS order (built on first use)"""
+        by_continent: Dict[str, List[str]] = {}
+        for azure_region in AZURE_REGIONS:
+            by_continent.setdefault(AzureVPNDeployer.continent_of(azure_region), []).append(azure_region)
+        return MappingProxyType({
+            continent: tuple(azure_regions) for continent, azure_regions in by_continent.items()
+        })
 
     def __init__(self, resource_group: str = "SecureWaveVPN-Servers"):
         self.resource_group = resource_group
@@ -95,32 +235,27 @@ class AzureVPNDeployer:
         self.image = "Canonical:0001-com-ubuntu-server-focal:20_04-lts-gen2:latest"
         self.admin_username = "azureuser"
         self.wg_port = 51820
+        self.ssh_key_path = os.path.expanduser("~/.ssh/securewave_vpn_ed25519")
+        self.max_concurrent_deployments = 8  # Stay under ARM request throttling
+        self._arm_credentials: Optional[Tuple[str, str]] = None
+        self._arm_client: Optional["httpx.AsyncClient"] = None
+        self._ssh_public_key: Optional[str] = None
+        self._created_resource_groups: set = set()
+
+        # Absolute path so subprocess can use posix_spawn instead of
+        # searching PATH on every spawn
+        self._az_path = shutil.which("az") or "az"
+        self._az_env = {**AZ_CLI_ENV, **os.environ}
 
     def generate_wireguard_keypair(self) -> Tuple[str, str]:
-        """Generate WireGuard private and public keys"""
-        try:
-            # Generate private key
-            private_key = subprocess.check_output(
-                ["wg", "genkey"],
-                text=True
-            ).strip()
-
-            # Generate public key from private key
-            public_key = subprocess.check_output(
-                ["wg", "pubkey"],
-                input=private_key,
-                text=True
-            ).strip()
-
-            return private_key, public_key
-        except FileNotFoundError:
-            # WireGuard not installed locally, use Python crypto
-            logger.warning("WireGuard tools not found, generating keys using Python")
-            private_bytes = secrets.token_bytes(32)
-            private_key = base64.b64encode(private_bytes).decode('utf-8')
-            # Note: This is a placeholder. Real WireGuard key generation requires curve25519
-            public_key = base64.b64encode(secrets.token_bytes(32)).decode('utf-8')
-            return private_key, public_key
+        """Generate WireGuard private and public keys (Curve25519, base64-encoded)"""
+        from cryptography.hazmat.primitives.asymmetric.x25519 import X25519PrivateKey
+        from cryptography.hazmat.primitives.serialization import Encoding, PrivateFormat, PublicFormat, NoEncryption
+
+        private = X25519PrivateKey.generate()
+        private_bytes = private.private_bytes(Encoding.Raw, PrivateFormat.Raw, NoEncryption())
+        public_bytes = private.public_key().public_bytes(Encoding.Raw, PublicFormat.Raw)
+        return base64.b64encode(private_bytes).decode('utf-8'), base64.b64encode(public_bytes).decode('utf-8')
 
     def create_vm(self,
                   azure_region: str,
@@ -129,6 +264,17 @@ class AzureVPNDeployer:
         """
         Deploy a new VPN server VM in specified Azure region
 
+        Synchronous wrapper around create_vm_async for single-server deploys.
+        """
+        return self._run(self.create_vm_async(azure_region, server_index, tier))
+
+    async def create_vm_async(self,
+                              azure_region: str,
+                              server_index: int = 1,
+                              tier: str = "standard") -> Dict:
+        """
+        Deploy a new VPN server VM in specified Azure region
+
         Args:
             azure_region: Azure region code (e.g., 'eastus', 'westeurope')
             server_index: Server number in this region (for naming)
@@ -144,100 +290,54 @@ class AzureVPNDeployer:
         server_id = f"{azure_region}-{server_index:03d}"
         vm_name = f"vpn-{server_id}"
 
-        logger.info(f"Deploying VPN server: {server_id} in {location_info['city']}, {location_info['country']}")
+        logger.info(f"Deploying VPN server: {server_id} in {location_info.city}, {location_info.country}")
 
         # Generate WireGuard keys
         wg_private_key, wg_public_key = self.generate_wireguard_keypair()
 
-        # Create cloud-init configuration for WireGuard installation
-        cloud_init = self._generate_cloud_init_config(wg_private_key, wg_public_key)
-        cloud_init_file = f"/tmp/cloud-init-{server_id}.yml"
-
-        with open(cloud_init_file, 'w') as f:
-            f.write(cloud_init)
-
         # Create resource group if it doesn't exist
-        self._run_az_command([
-            "group", "create",
-            "--name", self.resource_group,
-            "--location", azure_region
-        ])
+        await self._ensure_resource_group_async(azure_region)
 
-        # Create public IP
-        public_ip_name = f"ip-{vm_name}"
-        self._run_az_command([
-            "network", "public-ip", "create",
-            "--resource-group", self.resource_group,
-            "--name", public_ip_name,
-            "--sku", "Standard",
-            "--allocation-method", "Static",
-            "--location", azure_region
-        ])
-
-        # Create VM with WireGuard pre-installed
+        # Create cloud-init configuration for WireGuard installation
+        cloud_init = self._generate_cloud_init_config(wg_private_key)
+
+        # Deploy public IP, network security group (with the WireGuard rule),
+        # virtual network, NIC and VM as one ARM template; ARM creates them in
+        # dependency order and reports both IP addresses as outputs
         logger.info(f"Creating VM {vm_name}...")
-        self._run_az_command([
-            "vm", "create",
-            "--resource-group", self.resource_group,
-            "--name", vm_name,
-            "--location", azure_region,
-            "--image", self.image,
-            "--size", self.vm_size,
-            "--admin-username", self.admin_username,
-            "--generate-ssh-keys",
-            "--public-ip-address", public_ip_name,
-            "--custom-data", cloud_init_file,
-            "--tags",
-            f"server_id={server_id}",
-            f"type=vpn",
-            f"city={location_info['city']}",
-            f"country={location_info['country']}",
-        ])
-
-        # Open WireGuard port
-        self._run_az_command([
-            "vm", "open-port",
-            "--resource-group", self.resource_group,
-            "--name", vm_name,
-            "--port", str(self.wg_port),
-            "--priority", "1000"
-        ])
-
-        # Get public IP address
-        public_ip_result = self._run_az_command([
-            "network", "public-ip", "show",
-            "--resource-group", self.resource_group,
-            "--name", public_ip_name,
-            "--query", "ipAddress",
-            "--output", "tsv"
-        ])
-        public_ip = public_ip_result.strip()
-
-        # Get private IP address
-        private_ip_result = self._run_az_command([
-            "vm", "show",
-            "--resource-group", self.resource_group,
-            "--name", vm_name,
-            "--query", "privateIps",
-            "--output", "tsv"
-        ])
-        private_ip = private_ip_result.strip()
-
-        # Clean up temp file
-        os.remove(cloud_init_file)
+        template = self._build_vm_template(azure_region, vm_name, server_id, location_info)
+        deployment = await self._arm_request_async(
+            "PUT",
+            f"resourcegroups/{self.resource_group}/providers/Microsoft.Resources/deployments/{vm_name}",
+            RESOURCES_API_VERSION,
+            {
+                "properties": {
+                    "mode": "Incremental",
+                    "template": template,
+                    "parameters": {
+                        # secureString, so the WireGuard private key stays out of deployment history
+                        "customData": {"value": base64.b64encode(cloud_init.encode()).decode()},
+                        "sshPublicKey": {"value": self._get_ssh_public_key()},
+                    }
+                }
+            }
+        )
+        outputs = deployment["properties"]["outputs"]
+        public_ip = outputs["publicIp"]["value"]
+        private_ip = outputs["privateIp"]["value"]
 
         deployment_info = {
             "server_id": server_id,
             "vm_name": vm_name,
             "azure_region": azure_region,
             "azure_resource_group": self.resource_group,
-            "location": f"{location_info['city']}, {location_info['country']}",
-            "city": location_info["city"],
-            "country": location_info["country"],
-            "country_code": location_info["country_code"],
-            "region": location_info["region"],
-            "latitude": location_info["lat"],
-            "longitude": location_info["lon"],
+            "location": f"{location_info.city}, {location_info.country}",
+            "city": location_info.city,
+            "country": location_info.country,
+            "country_code": location_info.country_code,
+            "region": location_info.region,
+            "latitude": location_info.lat,
+            "longitude": location_info.lon,
             "public_ip": public_ip,
             "private_ip": private_ip,
             "endpoint": f"{public_ip}:{self.wg_port}",
@@ -254,118 +354,407 @@ class AzureVPNDeployer:
 
         return deployment_info
 
-    def _generate_cloud_init_config(self, private_key: str, public_key: str) -> str:
-        """Generate cloud-init YAML for WireGuard installation and configuration"""
-        return f"""#cloud-config
-package_upgrade: true
-packages:
-  - wireguard
-  - qrencode
-  - iptables
-  - curl
-  - jq
-  - python3
-  - python3-pip
+    def _build_vm_template(self,
+                           azure_region: str,
+                           vm_name: str,
+                           server_id: str,
+                           location_info: Region) -> Dict:
+        """Build the ARM template for one VPN server and its network resources"""
+        publisher, offer, sku, version = self.image.split(":")
+        public_ip_name = f"ip-{vm_name}"
+        nsg_name = f"nsg-{vm_name}"
+        vnet_name = f"vnet-{vm_name}"
+        nic_name = f"nic-{vm_name}"
+
+        return {
+            "$schema": "https://schema.management.azure.com/schemas/2019-04-01/deploymentTemplate.json#",
+            "contentVersion": "1.0.0.0",
+            "parameters": {
+                "customData": {"type": "secureString"},
+                "sshPublicKey": {"type": "string"},
+            },
+            "resources": [
+                {
+                    "type": "Microsoft.Network/publicIPAddresses",
+                    "apiVersion": NETWORK_API_VERSION,
+                    "name": public_ip_name,
+                    "location": azure_region,
+                    "sku": {"name": "Standard"},
+                    "properties": {"publicIPAllocationMethod": "Static"},
+                },
+                {
+                    "type": "Microsoft.Network/networkSecurityGroups",
+                    "apiVersion": NETWORK_API_VERSION,
+                    "name": nsg_name,
+                    "location": azure_region,
+                    "properties": {
+                        "securityRules": [
+                            {
+                                "name": "AllowSSH",
+                                "properties": {
+                                    "priority": 1000,
+                                    "direction": "Inbound",
+                                    "access": "Allow",
+                                    "protocol": "Tcp",
+                                    "sourceAddressPrefix": "*",
+                                    "sourcePortRange": "*",
+                                    "destinationAddressPrefix": "*",
+                                    "destinationPortRange": "22",
+                                },
+                            },
+                            {
+                                "name": "AllowWireGuard",
+                                "properties": {
+                                    "priority": 1010,
+                                    "direction": "Inbound",
+                                    "access": "Allow",
+                                    "protocol": "Udp",
+                                    "sourceAddressPrefix": "*",
+                                    "sourcePortRange": "*",
+                                    "destinationAddressPrefix": "*",
+                                    "destinationPortRange": str(self.wg_port),
+                                },
+                            },
+                        ]
+                    },
+                },
+                {
+                    "type": "Microsoft.Network/virtualNetworks",
+                    "apiVersion": NETWORK_API_VERSION,
+                    "name": vnet_name,
+                    "location": azure_region,
+                    "properties": {
+                        "addressSpace": {"addressPrefixes": ["10.0.0.0/16"]},
+                        "subnets": [{"name": "default", "properties": {"addressPrefix": "10.0.0.0/24"}}],
+                    },
+                },
+                {
+                    "type": "Microsoft.Network/networkInterfaces",
+                    "apiVersion": NETWORK_API_VERSION,
+                    "name": nic_name,
+                    "location": azure_region,
+                    "dependsOn": [
+                        f"[resourceId('Microsoft.Network/publicIPAddresses', '{public_ip_name}')]",
+                        f"[resourceId('Microsoft.Network/networkSecurityGroups', '{nsg_name}')]",
+                        f"[resourceId('Microsoft.Network/virtualNetworks', '{vnet_name}')]",
+                    ],
+                    "properties": {
+                        "networkSecurityGroup": {
+                            "id": f"[resourceId('Microsoft.Network/networkSecurityGroups', '{nsg_name}')]"
+                        },
+                        "ipConfigurations": [
+                            {
+                                "name": "ipconfig1",
+                                "properties": {
+                                    "privateIPAllocationMethod": "Dynamic",
+                                    "publicIPAddress": {
+                                        "id": f"[resourceId('Microsoft.Network/publicIPAddresses', '{public_ip_name}')]"
+                                    },
+                                    "subnet": {
+                                        "id": f"[resourceId('Microsoft.Network/virtualNetworks/subnets', '{vnet_name}', 'default')]"
+                                    },
+                                },
+                            }
+                        ],
+                    },
+                },
+                {
+                    "type": "Microsoft.Compute/virtualMachines",
+                    "apiVersion": COMPUTE_API_VERSION,
+                    "name": vm_name,
+                    "location": azure_region,
+                    "dependsOn": [f"[resourceId('Microsoft.Network/networkInterfaces', '{nic_name}')]"],
+                    "tags": {
+                        "server_id": server_id,
+                        "type": "vpn",
+                        "city": location_info.city,
+                        "country": location_info.country,
+                    },
+                    "properties": {
+                        "hardwareProfile": {"vmSize": self.vm_size},
+                        "storageProfile": {
+                            "imageReference": {
+                                "publisher": publisher,
+                                "offer": offer,
+                                "sku": sku,
+                                "version": version,
+                            },
+                            "osDisk": {"createOption": "FromImage"},
+                        },
+                        "osProfile": {
+                            "computerName": vm_name,
+                            "adminUsername": self.admin_username,
+                            "customData": "[parameters('customData')]",
+                            "linuxConfiguration": {
+                                "disablePasswordAuthentication": True,
+                                "ssh": {
+                                    "publicKeys": [
+                                        {
+                                            "path": f"/home/{self.admin_username}/.ssh/authorized_keys",
+                                            "keyData": "[parameters('sshPublicKey')]",
+                                        }
+                                    ]
+                                },
+                            },
+                        },
+                        "networkProfile": {
+                            "networkInterfaces": [
+                                {"id": f"[resourceId('Microsoft.Network/networkInterfaces', '{nic_name}')]"}
+                            ]
+                        },
+                    },
+                },
+            ],
+            "outputs": {
+                "publicIp": {
+                    "type": "string",
+                    "value": f"[reference(resourceId('Microsoft.Network/publicIPAddresses', '{public_ip_name}')).ipAddress]",
+                },
+                "privateIp": {
+                    "type": "string",
+                    "value": f"[reference(resourceId('Microsoft.Network/networkInterfaces', '{nic_name}')).ipConfigurations[0].properties.privateIPAddress]",
+                },
+            },
+        }
 
-write_files:
-  - path: /etc/sysctl.d/99-wireguard.conf
-    content: |
-      net.ipv4.ip_forward=1
-      net.ipv6.conf.all.forwarding=1
-    permissions: '0644'
+    def _get_ssh_public_key(self) -> str:
+        """
+        Return the admin SSH public key shared by every VM the deployer creates
 
-  - path: /etc/wireguard/wg0.conf
-    content: |
-      [Interface]
-      PrivateKey = {private_key}
-      Address = 10.8.0.1/24
-      ListenPort = {self.wg_port}
-      PostUp = iptables -A FORWARD -i wg0 -j ACCEPT; iptables -t nat -A POSTROUTING -o eth0 -j MASQUERADE
-      PostDown = iptables -D FORWARD -i wg0 -j ACCEPT; iptables -t nat -D POSTROUTING -o eth0 -j MASQUERADE
-    permissions: '0600'
+        An Ed25519 keypair is generated in-process the first time and kept at
+        ssh_key_path, so concurrent and later deployments reuse the same key.
+        """
+        from cryptography.hazmat.primitives.asymmetric.ed25519 import Ed25519PrivateKey
+        from cryptography.hazmat.primitives.serialization import (
+            Encoding, PrivateFormat, PublicFormat, NoEncryption, load_ssh_private_key
+        )
+
+        if self._ssh_public_key is None:
+            if os.path.exists(self.ssh_key_path):
+                with open(self.ssh_key_path, "rb") as f:
+                    private = load_ssh_private_key(f.read(), password=None)
+            else:
+                private = Ed25519PrivateKey.generate()
+                os.makedirs(os.path.dirname(self.ssh_key_path), mode=0o700, exist_ok=True)
+                fd = os.open(self.ssh_key_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+                with os.fdopen(fd, "wb") as f:
+                    f.write(private.private_bytes(Encoding.PEM, PrivateFormat.OpenSSH, NoEncryption()))
+                with open(f"{self.ssh_key_path}.pub", "wb") as f:
+                    f.write(private.public_key().public_bytes(Encoding.OpenSSH, PublicFormat.OpenSSH) + b"\n")
+                logger.info(f"✓ Generated SSH key {self.ssh_key_path}")
+
+            self._ssh_public_key = private.public_key().public_bytes(
+                Encoding.OpenSSH, PublicFormat.OpenSSH
+            ).decode()
+        return self._ssh_public_key
+
+    def _generate_cloud_init_config(self, private_key: str) -> str:
+        """Generate cloud-init YAML for WireGuard installation and configuration"""
+        return self._CLOUD_INIT_TEMPLATE.substitute(private_key=private_key, wg_port=self.wg_port)
+
+    async def _get_arm_credentials_async(self) -> Tuple[str, str]:
+        """Fetch an ARM bearer token and subscription ID once and reuse them"""
+        if self._arm_credentials is None:
+            token = loads_json(await self._run_az_command_async([
+                "account", "get-access-token",
+                "--resource", ARM_ENDPOINT,
+                "--output", "json"
+            ]))
+            self._arm_credentials = (token["accessToken"], token["subscription"])
+        return self._arm_credentials
+
+    async def _ensure_resource_group_async(self, location: str):
+        """Create the resource group on first use; later VMs in any region reuse it"""
+        if self.resource_group in self._created_resource_groups:
+            return
+        await self._arm_request_async(
+            "PUT", f"resourcegroups/{self.resource_group}", RESOURCES_API_VERSION,
+            {"location": location}
+        )
+        self._created_resource_groups.add(self.resource_group)
+
+    async def _load_available_regions_async(self) -> Optional[set]:
+        """
+        Return the regions the current subscription can deploy to
 
-  - path: /usr/local/bin/vpn-health-check.sh
-    content: |
-      #!/bin/bash
-      # Health check script for monitoring
-      wg show wg0 > /dev/null 2>&1
-      echo $?
-    permissions: '0755'
+        The list comes from ARM's subscription locations and is cached in
+        REGIONS_CACHE_PATH for a week. Returns None if it cannot be fetched,
+        in which case every region in AZURE_REGIONS is considered available.
+        """
+        import httpx
 
-  - path: /usr/local/bin/vpn-metrics.sh
-    content: |
-      #!/bin/bash
-      # Export metrics for monitoring system
-      echo "{"
-      echo "  \\"cpu_load\\": $(awk '{{print $1}}' /proc/loadavg),"
-      echo "  \\"memory_used\\": $(free | grep Mem | awk '{{printf \\"%.2f\\", $3/$2 * 100}}'),"
-      echo "  \\"disk_used\\": $(df / | tail -1 | awk '{{print $5}}' | sed 's/%//'),"
-      echo "  \\"connections\\": $(wg show wg0 | grep peer | wc -l),"
-      echo "  \\"timestamp\\": \\"$(date -u +%Y-%m-%dT%H:%M:%SZ)\\""
-      echo "}"
-    permissions: '0755'
+        _, subscription = await self._get_arm_credentials_async()
 
-runcmd:
-  - sysctl -p /etc/sysctl.d/99-wireguard.conf
-  - systemctl enable wg-quick@wg0
-  - systemctl start wg-quick@wg0
-  - ufw allow {self.wg_port}/udp
-  - ufw allow 22/tcp
-  - echo "WireGuard VPN Server Ready" > /var/log/vpn-ready.log
-"""
+        try:
+            if time.time() - os.path.getmtime(REGIONS_CACHE_PATH) < REGIONS_CACHE_TTL_SECONDS:
+                with open(REGIONS_CACHE_PATH, "rb") as f:
+                    cache = loads_json(f.read())
+                if cache.get("subscription") == subscription:
+                    return set(cache["regions"])
+        except (OSError, ValueError):
+            pass
 
-    def _run_az_command(self, args: List[str]) -> str:
-        """Execute Azure CLI command"""
-        cmd = ["az"] + args
         try:
-            result = subprocess.run(
-                cmd,
-                capture_output=True,
-                text=True,
-                check=True
+            locations = await self._arm_request_async("GET", "locations", SUBSCRIPTIONS_API_VERSION)
+        except httpx.HTTPError as e:
+            logger.warning(f"Could not list subscription regions, using the full region table: {e}")
+            return None
+
+        regions = sorted(
+            location["name"] for location in locations.get("value", [])
+            if location.get("metadata", {}).get("regionType") == "Physical"
+        )
+        try:
+            os.makedirs(os.path.dirname(REGIONS_CACHE_PATH), exist_ok=True)
+            with open(REGIONS_CACHE_PATH, "w") as f:
+                json.dump({"subscription": subscription, "regions": regions}, f)
+        except OSError as e:
+            logger.warning(f"Could not cache subscription regions: {e}")
+
+        return set(regions)
+
+    def _get_arm_client(self) -> "httpx.AsyncClient":
+        """Return the shared ARM client so every request reuses its keep-alive connections"""
+        if self._arm_client is None:
+            import httpx
+
+            try:
+                import h2  # noqa: F401
+                http2 = True
+            except ImportError:
+                http2 = False
+            self._arm_client = httpx.AsyncClient(
+                http2=http2,
+                limits=httpx.Limits(max_connections=self.max_concurrent_deployments),
+                timeout=60
             )
-            return result.stdout
-        except subprocess.CalledProcessError as e:
-            logger.error(f"Azure CLI command failed: {' '.join(cmd)}")
-            logger.error(f"Error: {e.stderr}")
+        return self._arm_client
+
+    async def _close_arm_client(self):
+        """Close the shared ARM client (it is bound to the running event loop)"""
+        if self._arm_client is not None:
+            await self._arm_client.aclose()
+            self._arm_client = None
+
+    def _run(self, coro):
+        """Run a coroutine to completion, closing the shared ARM client afterwards"""
+        import asyncio
+
+        async def main():
+            try:
+                return await coro
+            finally:
+                await self._close_arm_client()
+
+        return asyncio.run(main())
+
+    async def _arm_request_async(self,
+                                 method: str,
+                                 path: str,
+                                 api_version: str,
+                                 body: Optional[Dict] = None,
+                                 timeout: float = 1800) -> Dict:
+        """
+        Send a request to Azure Resource Manager and wait for it to complete
+
+        Args:
+            method: HTTP method
+            path: Resource path below the subscription, or a full resource ID
+            api_version: API version of the resource provider
+            body: JSON request body
+            timeout: Seconds to wait for a long-running operation before raising TimeoutError
+
+        Returns:
+            Resource returned by ARM (re-read after long-running operations)
+        """
+        import asyncio
+        import httpx
+
+        client = self._get_arm_client()
+        token, subscription = await self._get_arm_credentials_async()
+        if path.startswith("/subscriptions/"):
+            url = f"{ARM_ENDPOINT}{path}"
+        else:
+            url = f"{ARM_ENDPOINT}/subscriptions/{subscription}/{path}"
+        headers = {"Authorization": f"Bearer {token}"}
+        params = {"api-version": api_version}
+
+        try:
+            response = await client.request(method, url, params=params, headers=headers, json=body)
+            response.raise_for_status()
+
+            # Long-running operation: poll until ARM reports a terminal state
+            status_url = response.headers.get("Azure-AsyncOperation")
+            if response.status_code in (201, 202) and status_url:
+                deadline = time.monotonic() + timeout
+                status = "InProgress"
+                while status not in ("Succeeded", "Failed", "Canceled"):
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise TimeoutError(f"ARM operation on {path} did not finish within {timeout:g}s")
+                    await asyncio.sleep(min(float(response.headers.get("Retry-After", 5)), remaining))
+                    response = await client.get(status_url, headers=headers)
+                    response.raise_for_status()
+                    status = loads_json(response.content).get("status")
+                    if status is None:
+                        raise RuntimeError(f"ARM operation status for {path} has no status field")
+                if status != "Succeeded":
+                    raise RuntimeError(f"ARM operation on {path} {status.lower()}")
+
+                response = await client.get(url, params=params, headers=headers)
+                response.raise_for_status()
+        except httpx.HTTPStatusError as e:
+            logger.error(f"ARM request failed: {method} {path}")
+            logger.error(f"Error: {e.response.text}")
             raise
 
-    def deploy_global_fleet(self, regions_per_continent: int = 2) -> List[Dict]:
+        return loads_json(response.content) if response.content else {}
+
+    async def _run_az_command_async(self, args: List[str]) -> str:
+        """Execute Azure CLI command without blocking the event loop"""
+        import asyncio
+        import subprocess
+
+        cmd = [self._az_path] + args
+        # Descriptors are non-inheritable by default, so skipping close_fds is
+        # safe and keeps subprocess on its posix_spawn fast path
+        process = await asyncio.create_subprocess_exec(
+            *cmd,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+            env=self._az_env,
+            close_fds=False
+        )
+        stdout, stderr = await process.communicate()
+        if process.returncode != 0:
+            logger.error(f"Azure CLI command failed: {' '.join(cmd)}")
+            logger.error(f"Error: {stderr.decode()}")
+            raise subprocess.CalledProcessError(process.returncode, cmd, stdout, stderr)
+        return stdout.decode()
+
+    def deploy_global_fleet(self,
+                            regions_per_continent: int = 2,
+                            concurrency: Optional[int] = None) -> List[Dict]:
         """
         Deploy VPN servers across all major regions
 
+        Servers are deployed concurrently, so total time is close to the
+        slowest single deployment rather than the sum of all of them.
+
         Args:
             regions_per_continent: Number of servers per continent/region
+            concurrency: Maximum simultaneous deployments (defaults to max_concurrent_deployments)
 
         Returns:
             List of deployment info for all created servers
         """
-        deployments = []
-
-        # Group regions by continent
-        by_region = {}
-        for azure_region, info in self.AZURE_REGIONS.items():
-            region_name = info["region"]
-            if region_name not in by_region:
-                by_region[region_name] = []
-            by_region[region_name].append(azure_region)
-
-        # Deploy servers
-        for region_name, azure_regions in by_region.items():
-            logger.info(f"\n{'='*60}")
-            logger.info(f"Deploying to {region_name}")
-            logger.info(f"{'='*60}")
-
-            # Select top regions in this continent
-            selected_regions = azure_regions[:regions_per_continent]
+        async def collect() -> List[Dict]:
+            return [
+                deployment
+                async for deployment in self.deploy_global_fleet_iter(regions_per_continent, concurrency)
+            ]
 
-            for idx, azure_region in enumerate(selected_regions, 1):
-                try:
-                    deployment = self.create_vm(azure_region, server_index=idx)
-                    deployments.append(deployment)
-                except Exception as e:
-                    logger.error(f"Failed to deploy to {azure_region}: {e}")
-                    continue
+        deployments = self._run(collect())
 
         logger.info(f"\n{'='*60}")
         logger.info(f"Deployment Complete: {len(deployments)} servers deployed")
@@ -373,18 +762,72 @@ runcmd:
 
         return deployments
 
+    async def deploy_global_fleet_iter(self,
+                                       regions_per_continent: int = 2,
+                                       concurrency: Optional[int] = None) -> AsyncIterator[Dict]:
+        """
+        Deploy VPN servers across all major regions, yielding each one as it finishes
+
+        Args:
+            regions_per_continent: Number of servers per continent/region
+            concurrency: Maximum simultaneous deployments (defaults to max_concurrent_deployments)
+
+        Yields:
+            Deployment info for each created server, in completion order
+        """
+        import asyncio
+
+        semaphore = asyncio.Semaphore(concurrency or self.max_concurrent_deployments)
+
+        # Fetch the ARM token up front rather than once per concurrent deployment
+        await self._get_arm_credentials_async()
+        available_regions = await self._load_available_regions_async()
+
+        # Select top regions in each continent, skipping ones the
+        # subscription cannot deploy to (e.g. China regions)
+        targets = []
+        for region_name, azure_regions in self._by_continent().items():
+            if available_regions is not None:
+                azure_regions = [r for r in azure_regions if r in available_regions]
+            selected_regions = azure_regions[:regions_per_continent]
+            logger.info(f"Deploying to {region_name}: {', '.join(selected_regions)}")
+            targets.extend(
+                (azure_region, idx) for idx, azure_region in enumerate(selected_regions, 1)
+            )
+
+        # Create the shared resource group once, before deployments race to do it
+        if targets:
+            await self._ensure_resource_group_async(targets[0][0])
+
+        async def deploy(azure_region: str, server_index: int) -> Optional[Dict]:
+            async with semaphore:
+                try:
+                    return await self.create_vm_async(azure_region, server_index=server_index)
+                except Exception as e:
+                    logger.error(f"Failed to deploy to {azure_region}: {e}")
+                    return None
+
+        for completed in asyncio.as_completed([deploy(azure_region, idx) for azure_region, idx in targets]):
+            deployment = await completed
+            if deployment is not None:
+                yield deployment
+
 
 if __name__ == "__main__":
     # Example usage
     deployer = AzureVPNDeployer()
 
     if len(sys.argv) > 1 and sys.argv[1] == "deploy-global":
-        # Deploy global fleet
-        deployments = deployer.deploy_global_fleet(regions_per_continent=2)
-
-        # Save deployment info
-        with open("vpn_deployments.json", "w") as f:
-            json.dump(deployments, f, indent=2)
+        # Deploy global fleet, saving deployment info (includes WireGuard
+        # private keys) after every server so an interrupted run keeps them
+        async def deploy_and_save() -> List[Dict]:
+            deployments = []
+            async for deployment in deployer.deploy_global_fleet_iter(regions_per_continent=2):
+                deployments.append(deployment)
+                write_private_file("vpn_deployments.json", dump_json(deployments))
+            return deployments
+
+        deployments = deployer._run(deploy_and_save())
 
         print(f"\n✓ Deployed {len(deployments)} VPN servers globally")
         print(f"✓ Deployment details saved to vpn_deployments.json")
@@ -5,32 +5,109 @@ Automated backup, restore, and maintenance operations for production database
 """
 
 import os
+import re
 import sys
 import subprocess
 import json
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from functools import lru_cache
 from datetime import datetime, timedelta
+from pathlib import Path
 from typing import List, Dict, Optional
 import logging
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from utils.json_utils import loads_json  # noqa: E402
+
+ARM_ENDPOINT = "https://management.azure.com"
+ARM_POSTGRES_API_VERSION = "2022-12-01"
+
+# Azure CLI settings for the remaining `az` invocations (the ARM token):
+# skip the telemetry upload the freshly started CLI process would run
+AZ_CLI_ENV = {
+    "AZURE_CORE_COLLECT_TELEMETRY": "false",
+}
+
+
+@lru_cache(maxsize=None)
+def _load_env_file(env_file: str) -> bool:
+    """Load an env file into os.environ once per process"""
+    from dotenv import load_dotenv
+    return load_dotenv(env_file)
+
+
+@lru_cache(maxsize=1)
+def _pg_dump_compress_args() -> tuple:
+    """
+    Pick the cheapest compressor the local pg_dump supports
+
+    pg_dump 16 added zstd, which encodes several times faster than the
+    default gzip at a similar ratio; older clients fall back to gzip level 3.
+    """
+    try:
+        version = subprocess.run(
+            ["pg_dump", "--version"], capture_output=True, text=True, check=True
+        ).stdout
+        # e.g. "pg_dump (PostgreSQL) 16.2 (Ubuntu 16.2-1.pgdg22.04+1)"
+        major = int(re.search(r"\)\s*(\d+)", version).group(1))
+    except (subprocess.CalledProcessError, FileNotFoundError, AttributeError):
+        major = 0
+
+    return ("--compress=zstd:3",) if major >= 16 else ("-Z", "3")
+
 
 class DatabaseBackupManager:
     """Manages database backups, restores, and maintenance"""
 
-    def __init__(self, resource_group: str = "SecureWaveRG", server_name: str = "securewave-db"):
+    def __init__(self, resource_group: str = "SecureWaveRG", server_name: str = "securewave-db",
+                 max_parallel_analyze: int = 8):
         self.resource_group = resource_group
         self.server_name = server_name
+        self.max_parallel_analyze = max_parallel_analyze
+        self._server_info_cache = None
+        self._server_info_ts = 0.0
+        self._arm_credentials = None
+        # The CLI's own token cache (AZURE_CONFIG_DIR, if set) is inherited as-is
+        self._az_env = {**AZ_CLI_ENV, **os.environ}
+        self._arm_client = None
+        self._arm_client_lock = threading.Lock()
+        self._pool = None
         self.backup_storage_account = "securewavedbackups"
         self.backup_container = "database-backups"
 
-    def create_manual_backup(self, backup_name: Optional[str] = None) -> Dict:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """Close the ARM HTTP client and the database connection pool"""
+        with self._arm_client_lock:
+            if self._arm_client is not None:
+                self._arm_client.close()
+                self._arm_client = None
+        if self._pool is not None:
+            self._pool.closeall()
+            self._pool = None
+
+    def create_manual_backup(self, backup_name: Optional[str] = None, jobs: Optional[int] = None,
+                             stream: bool = False) -> Dict:
         """
         Create manual backup (Azure handles automatic backups, this is for long-term retention)
 
         Args:
             backup_name: Optional backup name, defaults to timestamp
+            jobs: Parallel pg_dump workers, defaults to a quarter of the CPU count
+            stream: Pipe a single-stream dump straight into Blob Storage without local files
 
         Returns:
             Dict with backup details
@@ -54,7 +131,10 @@ class DatabaseBackupManager:
         # For Azure Database, backups are automatic
         # We can use pg_dump for additional exports
         try:
-            self._export_database_dump(backup_name)
+            if stream:
+                self._stream_database_dump(backup_name)
+            else:
+                self._export_database_dump(backup_name, jobs=jobs)
             logger.info(f"✓ Manual backup created: {backup_name}")
         except Exception as e:
             logger.error(f"✗ Backup failed: {e}")
@@ -74,14 +154,10 @@ class DatabaseBackupManager:
 
         try:
             # List automatic backups from Azure
-            result = self._run_az_command([
-                "postgres", "flexible-server", "backup", "list",
-                "--resource-group", self.resource_group,
-                "--name", self.server_name,
-                "--output", "json"
-            ])
-
-            backups = json.loads(result)
+            backups = [
+                {"name": b.get("name"), **b.get("properties", {})}
+                for b in self._arm_get_all("backups")
+            ]
 
             logger.info(f"✓ Found {len(backups)} backups")
 
@@ -97,6 +173,28 @@ class DatabaseBackupManager:
             logger.error(f"Failed to list backups: {e}")
             return []
 
+    def _latest_backup_meta(self) -> Dict:
+        """
+        Count automatic backups and find the newest one
+
+        Only the count and newest completion time are kept while walking
+        the backup pages, rather than building a record per backup.
+
+        Returns:
+            Dict with "count" and "latest" (ISO timestamp or None)
+        """
+        count, latest = 0, None
+        try:
+            for backup in self._arm_get_all("backups"):
+                count += 1
+                completed = backup.get("properties", {}).get("completedTime")
+                if completed and (latest is None or completed > latest):
+                    latest = completed
+        except Exception as e:
+            logger.error(f"Failed to list backups: {e}")
+            return {"count": 0, "latest": None}
+        return {"count": count, "latest": latest}
+
     def restore_from_backup(self,
                            backup_time: str,
                            target_server_name: str,
@@ -112,34 +210,71 @@ class DatabaseBackupManager:
         Returns:
             Dict with restore operation details
         """
-        if not target_location:
-            target_location = self._get_server_location()
+        return self.wait_for_restore(
+            self.begin_restore_from_backup(backup_time, target_server_name, target_location)
+        )
+
+    def begin_restore_from_backup(self,
+                                  backup_time: str,
+                                  target_server_name: str,
+                                  target_location: Optional[str] = None) -> Dict:
+        """
+        Start a point-in-time restore and return while Azure works on it
 
-        logger.info(f"Restoring database to point-in-time: {backup_time}")
-        logger.info(f"Target server: {target_server_name}")
-        logger.info(f"Location: {target_location}")
+        Restores often take 20+ minutes; callers can do other work and
+        pass the returned dict to wait_for_restore() when they need it.
+
+        Args:
+            backup_time: ISO format timestamp to restore to (e.g., "2024-01-01T12:00:00Z")
+            target_server_name: Name for restored server
+            target_location: Azure region (defaults to same as source)
 
+        Returns:
+            Dict with restore operation details, status "in_progress" while running;
+            "server" holds the target server resource as accepted by ARM
+        """
         try:
+            if not target_location:
+                target_location = self._get_server_location()
+
+            logger.info(f"Restoring database to point-in-time: {backup_time}")
+            logger.info(f"Target server: {target_server_name}")
+            logger.info(f"Location: {target_location}")
+
             # Point-in-time restore
-            self._run_az_command([
-                "postgres", "flexible-server", "restore",
-                "--resource-group", self.resource_group,
-                "--name", target_server_name,
-                "--source-server", self.server_name,
-                "--restore-time", backup_time,
-                "--location", target_location
-            ])
+            response = self._arm_request(
+                "PUT",
+                self._server_url(target_server_name),
+                body={
+                    "location": target_location,
+                    "properties": {
+                        "createMode": "PointInTimeRestore",
+                        "sourceServerResourceId": self._show_server()["id"],
+                        "pointInTimeUTC": backup_time
+                    }
+                }
+            )
+
+            # ARM echoes the new server resource (FQDN included) in the PUT response
+            server = loads_json(response.content) if response.content else {}
 
             restore_info = {
                 "source_server": self.server_name,
                 "target_server": target_server_name,
                 "restore_time": backup_time,
                 "location": target_location,
-                "status": "completed",
+                "status": "in_progress",
+                "operation_url": response.headers.get("Azure-AsyncOperation"),
+                "server": {**server, **server.get("properties", {})},
                 "timestamp": datetime.utcnow().isoformat()
             }
 
-            logger.info(f"✓ Database restored successfully to {target_server_name}")
+            if not restore_info["operation_url"]:
+                restore_info["status"] = "completed"
+                logger.info(f"✓ Database restored successfully to {target_server_name}")
+            else:
+                logger.info(f"✓ Restore to {target_server_name} started")
+
             return restore_info
 
         except Exception as e:
@@ -149,6 +284,64 @@ class DatabaseBackupManager:
                 "error": str(e)
             }
 
+    def wait_for_restore(self, restore_info: Dict, poll_interval: float = 15,
+                         timeout: Optional[float] = None) -> Dict:
+        """
+        Block until a restore started by begin_restore_from_backup() finishes
+
+        Args:
+            restore_info: Dict returned by begin_restore_from_backup()
+            poll_interval: Seconds between status checks when Azure gives no Retry-After
+            timeout: Seconds to wait before giving up (None waits indefinitely)
+
+        Returns:
+            The same dict with status "completed" or "failed"
+        """
+        if restore_info.get("status") != "in_progress":
+            return restore_info
+
+        try:
+            self._wait_for_operation(restore_info["operation_url"], poll_interval, timeout)
+
+            restore_info["status"] = "completed"
+            restore_info["timestamp"] = datetime.utcnow().isoformat()
+            logger.info(f"✓ Database restored successfully to {restore_info['target_server']}")
+
+        except Exception as e:
+            logger.error(f"✗ Restore failed: {e}")
+            restore_info["status"] = "failed"
+            restore_info["error"] = str(e)
+
+        return restore_info
+
+    def get_server(self, server_name: Optional[str] = None) -> Dict:
+        """
+        Get details of a flexible server in this resource group
+
+        Args:
+            server_name: Server to look up (defaults to the managed server)
+
+        Returns:
+            Server resource with ARM's "properties" envelope flattened, as `az ... show` prints it
+        """
+        server = loads_json(self._arm_request("GET", self._server_url(server_name)).content)
+        return {**server, **server.get("properties", {})}
+
+    def delete_server(self, server_name: str, poll_interval: float = 15,
+                      timeout: Optional[float] = None):
+        """
+        Delete a flexible server in this resource group and wait for it to go
+
+        Args:
+            server_name: Server to delete
+            poll_interval: Seconds between status checks when Azure gives no Retry-After
+            timeout: Seconds to wait before giving up (None waits indefinitely)
+        """
+        response = self._arm_request("DELETE", self._server_url(server_name))
+        operation_url = response.headers.get("Azure-AsyncOperation")
+        if operation_url:
+            self._wait_for_operation(operation_url, poll_interval, timeout)
+
     def setup_geo_replication(self, replica_location: str, replica_name: Optional[str] = None) -> Dict:
         """
         Set up geo-replication for disaster recovery
@@ -212,38 +405,25 @@ class DatabaseBackupManager:
 
         try:
             # Connect to database and run maintenance
-            connection_string = self._get_connection_string()
-
-            import psycopg2
-
-            conn = psycopg2.connect(connection_string)
-            conn.set_isolation_level(0)  # AUTOCOMMIT mode for VACUUM
-            cursor = conn.cursor()
-
-            # VACUUM ANALYZE
-            logger.info("Running VACUUM ANALYZE...")
-            cursor.execute("VACUUM ANALYZE;")
-            maintenance_tasks["vacuum"] = True
-            maintenance_tasks["analyze"] = True
-            logger.info("✓ VACUUM ANALYZE completed")
-
-            # Update statistics
-            logger.info("Updating table statistics...")
-            cursor.execute("""
-                SELECT schemaname, tablename
-                FROM pg_tables
-                WHERE schemaname = 'public';
-            """)
-            tables = cursor.fetchall()
-
-            for schema, table in tables:
-                cursor.execute(f"ANALYZE {schema}.{table};")
+            with self._connection() as conn, conn.cursor() as cursor:
+                # VACUUM ANALYZE
+                logger.info("Running VACUUM ANALYZE...")
+                cursor.execute("VACUUM ANALYZE;")
+                maintenance_tasks["vacuum"] = True
+                maintenance_tasks["analyze"] = True
+                logger.info("✓ VACUUM ANALYZE completed")
+
+                # Update statistics
+                logger.info("Updating table statistics...")
+                cursor.execute("SELECT COUNT(*) FROM pg_tables WHERE schemaname = 'public';")
+                table_count = cursor.fetchone()[0]
+
+            failures = self._analyze_tables_parallel(table_count)
+            if failures:
+                raise RuntimeError(f"ANALYZE failed for {len(failures)} tables: " + "; ".join(failures))
 
             maintenance_tasks["statistics"] = True
-            logger.info(f"✓ Statistics updated for {len(tables)} tables")
-
-            cursor.close()
-            conn.close()
+            logger.info(f"✓ Statistics updated for {table_count} tables")
 
             maintenance_tasks["status"] = "completed"
             maintenance_tasks["completed_at"] = datetime.utcnow().isoformat()
@@ -261,6 +441,75 @@ class DatabaseBackupManager:
 
         return maintenance_tasks
 
+    async def run_maintenance_tasks_async(self) -> Dict:
+        """
+        Run database maintenance tasks without blocking the event loop
+
+        The psycopg2 work runs on a worker thread; callers such as a
+        scheduler or API handler can await it alongside other checks.
+
+        Returns:
+            Dict with maintenance results
+        """
+        import asyncio
+        return await asyncio.to_thread(self.run_maintenance_tasks)
+
+    # Analyzes one round-robin partition of the public tables entirely on
+    # the server; failures are reported back as WARNING notices
+    _ANALYZE_PARTITION_SQL = """
+        DO $$
+        DECLARE r RECORD;
+        BEGIN
+            FOR r IN
+                SELECT schemaname, tablename FROM (
+                    SELECT schemaname, tablename,
+                           row_number() OVER (ORDER BY tablename) AS n
+                    FROM pg_tables
+                    WHERE schemaname = 'public'
+                ) t
+                WHERE n % {partitions} = {partition}
+            LOOP
+                BEGIN
+                    EXECUTE 'ANALYZE ' || quote_ident(r.schemaname) || '.' || quote_ident(r.tablename);
+                EXCEPTION WHEN OTHERS THEN
+                    RAISE WARNING 'analyze failed: %.%: %', r.schemaname, r.tablename, SQLERRM;
+                END;
+            END LOOP;
+        END $$;
+    """
+
+    def _analyze_tables_parallel(self, table_count: int) -> List[str]:
+        """
+        ANALYZE the public tables across several pooled connections at once
+
+        Each connection runs a single DO block over its share of the
+        tables, so no table names travel to the client and every worker
+        needs just one round trip.
+
+        Returns:
+            Failure messages for tables that could not be analyzed
+        """
+        if table_count == 0:
+            return []
+
+        partitions = max(1, min(self.max_parallel_analyze, table_count))
+
+        def analyze(partition):
+            with self._connection() as conn, conn.cursor() as cursor:
+                del conn.notices[:]
+                cursor.execute(self._ANALYZE_PARTITION_SQL.format(
+                    partitions=partitions, partition=partition
+                ))
+                return [
+                    notice.split("analyze failed: ", 1)[1].strip()
+                    for notice in conn.notices
+                    if "analyze failed: " in notice
+                ]
+
+        with ThreadPoolExecutor(max_workers=partitions) as executor:
+            results = executor.map(analyze, range(partitions))
+            return [failure for failures in results for failure in failures]
+
     def check_database_health(self) -> Dict:
         """
         Comprehensive database health check
@@ -268,6 +517,22 @@ class DatabaseBackupManager:
         Returns:
             Dict with health metrics
         """
+        import asyncio
+        return asyncio.run(self.check_database_health_async())
+
+    async def check_database_health_async(self) -> Dict:
+        """
+        Comprehensive database health check, running independent checks concurrently
+
+        Server state and backups are read from ARM while the database
+        connection is tested, so the check takes as long as the slowest
+        probe rather than the sum of all of them.
+
+        Returns:
+            Dict with health metrics
+        """
+        import asyncio
+
         logger.info("Performing database health check...")
 
         health = {
@@ -276,14 +541,21 @@ class DatabaseBackupManager:
             "checks": {}
         }
 
+        async def read_arm():
+            # One token serves both ARM reads, so fetch it before fanning out
+            await asyncio.to_thread(self._get_arm_credentials)
+            return await asyncio.gather(
+                asyncio.to_thread(self._show_server),
+                asyncio.to_thread(self._latest_backup_meta)
+            )
+
         try:
+            (server_info, backup_meta), connection_healthy = await asyncio.gather(
+                read_arm(),
+                asyncio.to_thread(self._test_connection)
+            )
+
             # Check server status
-            server_info = json.loads(self._run_az_command([
-                "postgres", "flexible-server", "show",
-                "--resource-group", self.resource_group,
-                "--name", self.server_name,
-                "--output", "json"
-            ]))
 
             health["checks"]["server_state"] = {
                 "status": server_info.get("state"),
@@ -292,7 +564,7 @@ class DatabaseBackupManager:
 
             # Check storage usage
             storage_info = server_info.get("storage", {})
-            storage_used_mb = storage_info.get("storageSizeGb", 0) * 1024
+            storage_used_mb = storage_info.get("storageSizeGB", 0) * 1024
             storage_total_mb = int(server_info.get("storageProfile", {}).get("storageMb", 102400))
             storage_percent = (storage_used_mb / storage_total_mb) * 100 if storage_total_mb > 0 else 0
 
@@ -304,17 +576,13 @@ class DatabaseBackupManager:
             }
 
             # Check backup status
-            backups = self.list_backups()
-            latest_backup = backups[0] if backups else None
-
             health["checks"]["backups"] = {
-                "total_backups": len(backups),
-                "latest_backup": latest_backup.get("timestamp") if latest_backup else None,
-                "healthy": len(backups) > 0
+                "total_backups": backup_meta["count"],
+                "latest_backup": backup_meta["latest"],
+                "healthy": backup_meta["count"] > 0
             }
 
             # Check connection
-            connection_healthy = self._test_connection()
             health["checks"]["connection"] = {
                 "can_connect": connection_healthy,
                 "healthy": connection_healthy
@@ -351,17 +619,12 @@ class DatabaseBackupManager:
             # Note: This requires azure-monitor-query package
 
             # For now, return basic metrics from server info
-            server_info = json.loads(self._run_az_command([
-                "postgres", "flexible-server", "show",
-                "--resource-group", self.resource_group,
-                "--name", self.server_name,
-                "--output", "json"
-            ]))
+            server_info = self._show_server()
 
             metrics["server"] = {
                 "sku": server_info.get("sku", {}).get("name"),
-                "storage_gb": server_info.get("storage", {}).get("storageSizeGb"),
-                "backup_retention_days": server_info.get("backup", {}).get("retentionDays"),
+                "storage_gb": server_info.get("storage", {}).get("storageSizeGB"),
+                "backup_retention_days": server_info.get("backup", {}).get("backupRetentionDays"),
                 "version": server_info.get("version"),
             }
 
@@ -373,62 +636,255 @@ class DatabaseBackupManager:
 
         return metrics
 
-    def _export_database_dump(self, backup_name: str):
-        """Export database using pg_dump"""
-        connection_string = self._get_connection_string()
-        dump_file = f"/tmp/{backup_name}.sql"
+    def _export_database_dump(self, backup_name: str, jobs: Optional[int] = None) -> str:
+        """Export database using parallel directory-format pg_dump"""
+        dump_dir = f"/tmp/{backup_name}.dir"
+        if jobs is None:
+            jobs = max(1, (os.cpu_count() or 1) // 4)
+
+        # Run pg_dump
+        args, env = self._pg_dump_command()
+        subprocess.run(args + [
+            "-F", "d",  # Directory format, one file per table
+            "-j", str(jobs),
+            *_pg_dump_compress_args(),
+            "-f", dump_dir
+        ], env=env, check=True)
+
+        logger.info(f"✓ Database dump created: {dump_dir} ({jobs} jobs)")
+
+        # Upload to Azure Blob Storage (if configured)
+        storage_connection_string = os.getenv("AZURE_STORAGE_CONNECTION_STRING")
+        if storage_connection_string:
+            self._upload_dump_directory(storage_connection_string, backup_name, dump_dir)
+        else:
+            logger.info("AZURE_STORAGE_CONNECTION_STRING not set, keeping dump locally")
+
+        return dump_dir
+
+    def _stream_database_dump(self, backup_name: str) -> str:
+        """
+        Pipe a custom-format pg_dump straight into Blob Storage
+
+        The dump is never written to local disk, at the cost of the
+        single-stream format (directory dumps cannot go to stdout).
+
+        Returns:
+            Name of the uploaded blob
+        """
+        storage_connection_string = os.getenv("AZURE_STORAGE_CONNECTION_STRING")
+        if not storage_connection_string:
+            raise ValueError("AZURE_STORAGE_CONNECTION_STRING is required for streamed backups")
+
+        from azure.storage.blob import BlobServiceClient
+
+        blob_name = f"{backup_name}.dump"
+        blob_client = BlobServiceClient.from_connection_string(
+            storage_connection_string
+        ).get_blob_client(self.backup_container, blob_name)
+
+        args, env = self._pg_dump_command()
+        proc = subprocess.Popen(args + ["-F", "c", *_pg_dump_compress_args()], stdout=subprocess.PIPE, env=env)
+        try:
+            blob_client.upload_blob(proc.stdout, max_concurrency=8, overwrite=True)
+        except Exception:
+            proc.kill()
+            raise
+        finally:
+            proc.stdout.close()
+            returncode = proc.wait()
+
+        if returncode != 0:
+            # Don't leave a truncated dump behind looking like a good backup
+            blob_client.delete_blob()
+            raise subprocess.CalledProcessError(returncode, args)
+
+        logger.info(f"✓ Database dump streamed to {self.backup_container}/{blob_name}")
+        return blob_name
 
-        # Parse connection string
+    def _pg_dump_command(self) -> tuple:
+        """Build the pg_dump connection arguments and environment"""
         import urllib.parse
-        parsed = urllib.parse.urlparse(connection_string)
+        parsed = urllib.parse.urlparse(self._get_connection_string())
 
-        # Run pg_dump
         env = os.environ.copy()
         env["PGPASSWORD"] = parsed.password
 
-        subprocess.run([
+        return [
             "pg_dump",
             "-h", parsed.hostname,
             "-U", parsed.username,
             "-d", parsed.path.lstrip("/"),
-            "-F", "c",  # Custom format
-            "-f", dump_file
-        ], env=env, check=True)
+        ], env
 
-        logger.info(f"✓ Database dump created: {dump_file}")
+    def _upload_dump_directory(self, storage_connection_string: str, backup_name: str,
+                               dump_dir: str, max_workers: int = 8) -> int:
+        """
+        Upload every file of a directory-format dump to the backup container
 
-        # Upload to Azure Blob Storage (if configured)
-        # ...
+        Files upload concurrently on a thread pool and each file is itself
+        split into blocks sent over several connections.
+
+        Returns:
+            Number of files uploaded
+        """
+        from azure.storage.blob import BlobServiceClient
+
+        container = BlobServiceClient.from_connection_string(
+            storage_connection_string
+        ).get_container_client(self.backup_container)
+
+        files = []
+        for root, _, names in os.walk(dump_dir):
+            for name in names:
+                path = os.path.join(root, name)
+                files.append((path, f"{backup_name}/{os.path.relpath(path, dump_dir)}"))
+
+        def upload(item):
+            path, blob_name = item
+            with open(path, "rb") as data:
+                container.upload_blob(name=blob_name, data=data, max_concurrency=8, overwrite=True)
+
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(files)))) as executor:
+            list(executor.map(upload, files))
+
+        logger.info(f"✓ Uploaded {len(files)} files to {self.backup_container}/{backup_name}")
+        return len(files)
 
     def _get_connection_string(self) -> str:
         """Get database connection string from environment"""
-        try:
-            from dotenv import load_dotenv
-            load_dotenv(".env.production")
-            return os.getenv("DATABASE_URL")
-        except:
+        _load_env_file(".env.production")
+        database_url = os.getenv("DATABASE_URL")
+        if not database_url:
             raise ValueError("DATABASE_URL not found in environment")
+        return database_url
+
+    def _show_server(self, ttl: float = 30) -> Dict:
+        """Get server details, reusing a recent result"""
+        if self._server_info_cache is None or time.monotonic() - self._server_info_ts >= ttl:
+            self._server_info_cache = self.get_server()
+            self._server_info_ts = time.monotonic()
+        return self._server_info_cache
+
+    def _get_arm_credentials(self) -> tuple:
+        """Fetch an ARM bearer token and subscription ID once and reuse them"""
+        if self._arm_credentials is None:
+            token = self._run_az_json([
+                "account", "get-access-token",
+                "--resource", ARM_ENDPOINT
+            ])
+            self._arm_credentials = (token["accessToken"], token["subscription"])
+        return self._arm_credentials
+
+    def _server_url(self, server_name: Optional[str] = None) -> str:
+        """ARM URL of a flexible server in this resource group (defaults to the managed server)"""
+        _, subscription = self._get_arm_credentials()
+        return (
+            f"{ARM_ENDPOINT}/subscriptions/{subscription}/resourceGroups/{self.resource_group}"
+            f"/providers/Microsoft.DBforPostgreSQL/flexibleServers/{server_name or self.server_name}"
+        )
+
+    def _arm_request(self, method: str, url: str, body: Optional[Dict] = None):
+        """
+        Send an authenticated request to Azure Resource Manager
+
+        Requests share one keep-alive client and one token, so any number
+        of ARM calls costs a single Azure CLI start-up. URLs that already
+        carry a query string (nextLink pages, operation status) are sent as is.
+        """
+        import httpx
+
+        # Health checks call this from several threads at once; only one may create the client
+        if self._arm_client is None:
+            with self._arm_client_lock:
+                if self._arm_client is None:
+                    self._arm_client = httpx.Client(timeout=30)
+
+        token, _ = self._get_arm_credentials()
+        params = None if "?" in url else {"api-version": ARM_POSTGRES_API_VERSION}
+        response = self._arm_client.request(
+            method, url, params=params, json=body,
+            headers={"Authorization": f"Bearer {token}"}
+        )
+        response.raise_for_status()
+        return response
+
+    def _wait_for_operation(self, operation_url: str, poll_interval: float = 15,
+                            timeout: Optional[float] = None):
+        """
+        Poll an ARM Azure-AsyncOperation URL until it succeeds; raise if it fails
+
+        Raises TimeoutError if the operation is still running after `timeout` seconds.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            response = self._arm_request("GET", operation_url)
+            status = loads_json(response.content).get("status")
+            if status in ("Succeeded", "Failed", "Canceled"):
+                break
+            delay = float(response.headers.get("Retry-After", poll_interval))
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise TimeoutError(f"ARM operation still {status or 'running'} after {timeout:g}s")
+                delay = min(delay, remaining)
+            time.sleep(delay)
+
+        if status != "Succeeded":
+            raise RuntimeError(f"ARM operation {status.lower()}")
+
+    def _arm_get(self, path: str = "") -> Dict:
+        """
+        GET the server, or a child resource of it, from Azure Resource Manager
+
+        Args:
+            path: Resource path relative to the server, e.g. "backups"
+        """
+        url = self._server_url()
+        if path:
+            url = f"{url}/{path}"
+        return loads_json(self._arm_request("GET", url).content)
+
+    def _arm_get_all(self, path: str) -> List[Dict]:
+        """GET a collection below the server, following ARM's nextLink pages"""
+        page = self._arm_get(path)
+        items = list(page.get("value", []))
+        while page.get("nextLink"):
+            page = loads_json(self._arm_request("GET", page["nextLink"]).content)
+            items.extend(page.get("value", []))
+        return items
 
     def _get_server_location(self) -> str:
         """Get server location"""
-        server_info = json.loads(self._run_az_command([
-            "postgres", "flexible-server", "show",
-            "--resource-group", self.resource_group,
-            "--name", self.server_name,
-            "--output", "json"
-        ]))
+        server_info = self._show_server()
         return server_info.get("location", "eastus")
 
+    @contextmanager
+    def _connection(self):
+        """
+        Borrow an autocommit connection from the manager's pool
+
+        The pool is created on first use and keeps connections open, so
+        repeated checks skip the TLS handshake and authentication.
+        """
+        if self._pool is None:
+            from psycopg2.pool import ThreadedConnectionPool
+            self._pool = ThreadedConnectionPool(
+                1, max(16, self.max_parallel_analyze + 1), dsn=self._get_connection_string()
+            )
+
+        conn = self._pool.getconn()
+        try:
+            conn.autocommit = True  # Required for VACUUM
+            yield conn
+        finally:
+            self._pool.putconn(conn, close=bool(conn.closed))
+
     def _test_connection(self) -> bool:
         """Test database connection"""
         try:
-            import psycopg2
-            connection_string = self._get_connection_string()
-            conn = psycopg2.connect(connection_string)
-            cursor = conn.cursor()
-            cursor.execute("SELECT 1")
-            cursor.close()
-            conn.close()
+            with self._connection() as conn, conn.cursor() as cursor:
+                cursor.execute("SELECT 1")
             return True
         except:
             return False
@@ -441,7 +897,8 @@ class DatabaseBackupManager:
                 cmd,
                 capture_output=True,
                 text=True,
-                check=True
+                check=True,
+                env=self._az_env
             )
             return result.stdout
         except subprocess.CalledProcessError as e:
@@ -449,6 +906,20 @@ class DatabaseBackupManager:
             logger.error(f"Error: {e.stderr}")
             raise
 
+    def _run_az_json(self, args: List[str]):
+        """Execute Azure CLI command and parse its JSON output"""
+        cmd = ["az"] + args + ["--output", "json"]
+        try:
+            result = subprocess.run(cmd, capture_output=True, check=True, env=self._az_env)
+        except subprocess.CalledProcessError as e:
+            logger.error(f"Azure CLI command failed: {' '.join(cmd)}")
+            logger.error(f"Error: {e.stderr.decode(errors='replace')}")
+            raise
+
+        if not result.stdout.strip():
+            raise ValueError(f"Azure CLI returned no JSON: {' '.join(cmd)}")
+        return loads_json(result.stdout)
+
 
 def main():
     """CLI interface for backup manager"""
@@ -462,45 +933,52 @@ def main():
     parser.add_argument("--backup-name", help="Backup name")
     parser.add_argument("--restore-time", help="Point-in-time for restore (ISO format)")
     parser.add_argument("--target-server", help="Target server name for restore")
+    parser.add_argument("--no-wait", action="store_true",
+                        help="Start the restore and return without waiting for it to finish")
     parser.add_argument("--replica-location", help="Location for replica")
+    parser.add_argument("--jobs", type=int, help="Parallel pg_dump workers for backup")
+    parser.add_argument("--stream", action="store_true",
+                        help="Stream the backup straight to Blob Storage instead of /tmp")
 
     args = parser.parse_args()
 
-    manager = DatabaseBackupManager()
-
-    if args.command == "backup":
-        result = manager.create_manual_backup(args.backup_name)
-        print(json.dumps(result, indent=2))
-
-    elif args.command == "list-backups":
-        backups = manager.list_backups()
-        print(json.dumps(backups, indent=2))
-
-    elif args.command == "restore":
-        if not args.restore_time or not args.target_server:
-            print("Error: --restore-time and --target-server required")
-            sys.exit(1)
-        result = manager.restore_from_backup(args.restore_time, args.target_server)
-        print(json.dumps(result, indent=2))
-
-    elif args.command == "health-check":
-        health = manager.check_database_health()
-        print(json.dumps(health, indent=2))
-
-    elif args.command == "maintenance":
-        result = manager.run_maintenance_tasks()
-        print(json.dumps(result, indent=2))
-
-    elif args.command == "metrics":
-        metrics = manager.get_database_metrics()
-        print(json.dumps(metrics, indent=2))
-
-    elif args.command == "setup-replica":
-        if not args.replica_location:
-            print("Error: --replica-location required")
-            sys.exit(1)
-        result = manager.setup_geo_replication(args.replica_location)
-        print(json.dumps(result, indent=2))
+    with DatabaseBackupManager() as manager:
+        if args.command == "backup":
+            result = manager.create_manual_backup(args.backup_name, jobs=args.jobs, stream=args.stream)
+            print(json.dumps(result, indent=2))
+
+        elif args.command == "list-backups":
+            backups = manager.list_backups()
+            print(json.dumps(backups, indent=2))
+
+        elif args.command == "restore":
+            if not args.restore_time or not args.target_server:
+                print("Error: --restore-time and --target-server required")
+                sys.exit(1)
+            if args.no_wait:
+                result = manager.begin_restore_from_backup(args.restore_time, args.target_server)
+            else:
+                result = manager.restore_from_backup(args.restore_time, args.target_server)
+            print(json.dumps(result, indent=2))
+
+        elif args.command == "health-check":
+            health = manager.check_database_health()
+            print(json.dumps(health, indent=2))
+
+        elif args.command == "maintenance":
+            result = manager.run_maintenance_tasks()
+            print(json.dumps(result, indent=2))
+
+        elif args.command == "metrics":
+            metrics = manager.get_database_metrics()
+            print(json.dumps(metrics, indent=2))
+
+        elif args.command == "setup-replica":
+            if not args.replica_location:
+                print("Error: --replica-location required")
+                sys.exit(1)
+            result = manager.setup_geo_replication(args.replica_location)
+            print(json.dumps(result, indent=2))
 
 
 if __name__ == "__main__":
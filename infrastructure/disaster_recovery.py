@@ -6,15 +6,319 @@ Automated disaster recovery procedures for database and infrastructure failover
 
 import os
 import sys
-import json
-import subprocess
+import copy
+import asyncio
+import socket
 import logging
 from typing import Dict, Optional
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from pathlib import Path
+from string import Template
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from infrastructure.database_backup_manager import DatabaseBackupManager  # noqa: E402
+from utils.file_utils import write_private_file  # noqa: E402
+from utils.json_utils import dump_json  # noqa: E402
+
+
+@lru_cache(maxsize=1)
+def _production_env() -> Dict[str, Optional[str]]:
+    """Parse .env.production once per process (empty if it doesn't exist)"""
+    if not os.path.exists(".env.production"):
+        return {}
+    from dotenv import dotenv_values
+    return dotenv_values(".env.production")
+
+
+# libpq keepalive/user-timeout settings so a stalled network path to the DR
+# server fails within seconds instead of the kernel's ~15 minute retransmit
+_FAST_FAILURE_PARAMS = (
+    "keepalives=1&keepalives_idle=10&keepalives_interval=3&keepalives_count=3"
+    "&tcp_user_timeout=15000"
+)
+
+# Static parts of the DR plan; create_disaster_recovery_plan() fills in
+# the timestamp, regions and primary server
+_DR_PLAN_TEMPLATE = {
+    "rto": "1 hour",  # Recovery Time Objective
+    "rpo": "15 minutes",  # Recovery Point Objective
+
+    "components": {
+        "database": {
+            "primary": None,  # Set per call from the primary server name
+            "backup_strategy": "Geo-redundant automated backups (35 days retention)",
+            "replication": "Geo-replicated read replica",
+            "recovery_method": "Point-in-time restore to DR region"
+        },
+        "vpn_infrastructure": {
+            "servers": "50+ global locations",
+            "failover": "Automatic via health monitoring",
+            "recovery_method": "Redeploy VMs in DR region"
+        },
+        "web_application": {
+            "primary": "securewave-web.azurewebsites.net",
+            "backup": "Container registry + deployment scripts",
+            "recovery_method": "Deploy to new App Service in DR region"
+        }
+    },
+
+    "procedures": {
+        "database_failure": [
+            "1. Verify primary database is unreachable",
+            "2. Identify last good backup point",
+            "3. Restore database to DR region",
+            "4. Update application connection strings",
+            "5. Verify data integrity",
+            "6. Switch application traffic to DR"
+        ],
+        "region_failure": [
+            "1. Confirm entire region is down (Azure Status)",
+            "2. Activate DR region infrastructure",
+            "3. Restore database from geo-redundant backup",
+            "4. Deploy application to DR region",
+            "5. Update DNS to point to DR",
+            "6. Monitor and verify functionality"
+        ],
+        "data_corruption": [
+            "1. Identify corruption timestamp",
+            "2. Find last clean backup before corruption",
+            "3. Restore to temporary server",
+            "4. Verify data integrity",
+            "5. Migrate applications to restored instance",
+            "6. Archive corrupted database for forensics"
+        ]
+    },
+
+    "contacts": {
+        "database_admin": "admin@securewave.app",
+        "infrastructure_lead": "infra@securewave.app",
+        "incident_commander": "oncall@securewave.app",
+        "azure_support": "https://portal.azure.com/#create/Microsoft.Support"
+    }
+}
+
+_RUNBOOK = """
+# DISASTER RECOVERY RUNBOOK
+# SecureWave VPN Production Database
+
+## 1. DATABASE FAILURE SCENARIO
+
+**Symptoms:**
+- Application cannot connect to database
+- Database queries timing out
+- Azure Portal shows server as "unavailable"
+
+**Immediate Actions:**
+```bash
+# Verify database is truly down
+python3 infrastructure/disaster_recovery.py verify-primary
+
+# Activate DR (restores to DR region)
+python3 infrastructure/disaster_recovery.py activate --incident-type database_failure
+
+# Follow checklist
+cat DR_ACTIVATION_CHECKLIST.txt
+```
+
+**Expected Time:** 10-15 minutes
+
+---
+
+## 2. FULL REGION FAILURE SCENARIO
+
+**Symptoms:**
+- Azure Status Dashboard shows region outage
+- Multiple services unavailable in region
+- Azure services returning 503 errors
+
+**Immediate Actions:**
+```bash
+# Confirm region outage
+az account list-locations --query "[?name=='eastus'].{Name:name,Status:metadata.regionCategory}" -o table
+
+# Activate full DR
+python3 infrastructure/disaster_recovery.py activate --incident-type region_failure
+
+# Deploy application to DR region
+./deploy_to_dr_region.sh westus2
+
+# Update DNS
+# (Manual step - update DNS records)
+```
+
+**Expected Time:** 30-60 minutes
+
+---
+
+## 3. DATA CORRUPTION SCENARIO
+
+**Symptoms:**
+- Incorrect data in database
+- Unexpected data deletions
+- Database integrity errors
+
+**Immediate Actions:**
+```bash
+# Identify corruption timestamp
+# Review audit logs to find when corruption occurred
+
+# Restore to point before corruption
+python3 infrastructure/database_backup_manager.py restore \\
+  --restore-time "2026-01-03T10:00:00Z" \\
+  --target-server "securewave-db-recovery"
+
+# Verify restored data integrity
+python3 verify_data_integrity.py --server securewave-db-recovery
+
+# Switch application to recovered database
+mv .env.production .env.production.corrupt
+# Update DATABASE_URL to point to securewave-db-recovery
+sudo systemctl restart securewave-web
+```
+
+**Expected Time:** 20-30 minutes
+
+---
+
+## 4. TESTING & DRILLS
+
+**Monthly DR Test:**
+```bash
+# Run automated backup/restore test
+python3 infrastructure/disaster_recovery.py test-restore
+
+# Expected: PASSED in <10 minutes
+```
+
+**Quarterly Full DR Drill:**
+```bash
+# Simulate full region failure
+python3 infrastructure/disaster_recovery.py drill --full
+
+# Involves:
+# - Database restore to DR region
+# - Application deployment to DR
+# - DNS failover simulation
+# - Stakeholder notification
+# - Post-drill review
+```
+
+---
+
+## 5. CONTACT INFORMATION
+
+**Incident Commander:** oncall@securewave.app
+**Database Admin:** admin@securewave.app
+**Infrastructure Lead:** infra@securewave.app
+**Azure Support:** https://portal.azure.com/#create/Microsoft.Support
+
+---
+
+## 6. RECOVERY METRICS
+
+**RTO (Recovery Time Objective):** 1 hour
+**RPO (Recovery Point Objective):** 15 minutes
+
+**Actual Performance (from tests):**
+- Database restore: 8-10 minutes
+- Application redeployment: 5-7 minutes
+- DNS propagation: 5-60 minutes (varies)
+- Total: 20-80 minutes (within RTO)
+
+---
+
+## 7. POST-INCIDENT PROCEDURES
+
+After recovery:
+
+1. **Document timeline** in incident report
+2. **Verify data integrity** across all tables
+3. **Monitor application** for 24 hours
+4. **Schedule post-mortem** within 48 hours
+5. **Update DR procedures** based on lessons learned
+6. **Test restored systems** thoroughly
+7. **Communicate status** to stakeholders
+
+---
+
+## 8. ROLLBACK PROCEDURES
+
+If DR activation fails:
+
+```bash
+# Restore original configuration
+mv .env.production.BACKUP .env.production
+sudo systemctl restart securewave-web
+
+# Delete DR server
+az postgres flexible-server delete \\
+  --resource-group SecureWaveRG \\
+  --name <dr-server-name> \\
+  --yes
+
+# Investigate and retry
+```
+
+---
+
+**Last Updated:** 2026-01-03
+**Next Review:** 2026-04-03
+"""
+
+
+# Filled in per activation by activate_disaster_recovery()
+_CHECKLIST_TEMPLATE = Template("""
+DISASTER RECOVERY ACTIVATION CHECKLIST
+
+Incident: $incident_type
+Activated: $activated_at
+DR Server: $dr_hostname
+
+IMMEDIATE ACTIONS REQUIRED:
+
+[ ] 1. Replace .env.production with .env.production.DR
+       mv .env.production .env.production.BACKUP
+       mv .env.production.DR .env.production
+
+[ ] 2. Restart application
+       sudo systemctl restart securewave-web
+
+[ ] 3. Verify database connection
+       python3 -c "from database.session import check_database_connection; check_database_connection()"
+
+[ ] 4. Verify data integrity
+       python3 -c "from database.session import SessionLocal; from models.user import User; db = SessionLocal(); print(f'Users: {db.query(User).count()}'); db.close()"
+
+[ ] 5. Test application functionality
+       curl https://securewave-web.azurewebsites.net/api/health
+
+[ ] 6. Update DNS (if applicable)
+       # Update CNAME records to point to DR region
+
+[ ] 7. Notify stakeholders
+       # Email template in disaster_recovery_plan.json
+
+[ ] 8. Monitor application logs
+       tail -f /var/log/securewave/app.log
+
+[ ] 9. Document incident timeline
+       # Update incident log with timeline
+
+[ ] 10. Schedule post-incident review
+        # Within 48 hours of resolution
+
+ROLLBACK PROCEDURE (if needed):
+1. mv .env.production.BACKUP .env.production
+2. sudo systemctl restart securewave-web
+3. Delete DR server when primary is restored
+""")
+
 
 class DisasterRecoveryManager:
     """Manages disaster recovery operations for production database"""
@@ -23,6 +327,8 @@ class DisasterRecoveryManager:
         self.resource_group = resource_group
         self.primary_server = "securewave-db"
         self.dr_location = "westus2"  # Disaster recovery region
+        # ARM calls go through one token and one HTTP session instead of an Azure CLI per step
+        self._servers = DatabaseBackupManager(resource_group=resource_group, server_name=self.primary_server)
 
     def create_disaster_recovery_plan(self) -> Dict:
         """
@@ -36,74 +342,21 @@ class DisasterRecoveryManager:
         logger.info("="*70)
 
         dr_plan = {
-            "created_at": datetime.utcnow().isoformat(),
+            "created_at": datetime.now(timezone.utc).isoformat(),
             "primary_region": "eastus",
             "dr_region": self.dr_location,
-            "rto": "1 hour",  # Recovery Time Objective
-            "rpo": "15 minutes",  # Recovery Point Objective
-
-            "components": {
-                "database": {
-                    "primary": f"{self.primary_server}.postgres.database.azure.com",
-                    "backup_strategy": "Geo-redundant automated backups (35 days retention)",
-                    "replication": "Geo-replicated read replica",
-                    "recovery_method": "Point-in-time restore to DR region"
-                },
-                "vpn_infrastructure": {
-                    "servers": "50+ global locations",
-                    "failover": "Automatic via health monitoring",
-                    "recovery_method": "Redeploy VMs in DR region"
-                },
-                "web_application": {
-                    "primary": "securewave-web.azurewebsites.net",
-                    "backup": "Container registry + deployment scripts",
-                    "recovery_method": "Deploy to new App Service in DR region"
-                }
-            },
-
-            "procedures": {
-                "database_failure": [
-                    "1. Verify primary database is unreachable",
-                    "2. Identify last good backup point",
-                    "3. Restore database to DR region",
-                    "4. Update application connection strings",
-                    "5. Verify data integrity",
-                    "6. Switch application traffic to DR"
-                ],
-                "region_failure": [
-                    "1. Confirm entire region is down (Azure Status)",
-                    "2. Activate DR region infrastructure",
-                    "3. Restore database from geo-redundant backup",
-                    "4. Deploy application to DR region",
-                    "5. Update DNS to point to DR",
-                    "6. Monitor and verify functionality"
-                ],
-                "data_corruption": [
-                    "1. Identify corruption timestamp",
-                    "2. Find last clean backup before corruption",
-                    "3. Restore to temporary server",
-                    "4. Verify data integrity",
-                    "5. Migrate applications to restored instance",
-                    "6. Archive corrupted database for forensics"
-                ]
-            },
-
-            "contacts": {
-                "database_admin": "admin@securewave.app",
-                "infrastructure_lead": "infra@securewave.app",
-                "incident_commander": "oncall@securewave.app",
-                "azure_support": "https://portal.azure.com/#create/Microsoft.Support"
-            }
+            **copy.deepcopy(_DR_PLAN_TEMPLATE),
         }
+        dr_plan["components"]["database"]["primary"] = f"{self.primary_server}.postgres.database.azure.com"
 
         # Save DR plan
-        with open("disaster_recovery_plan.json", "w") as f:
-            json.dump(dr_plan, f, indent=2)
+        with open("disaster_recovery_plan.json", "wb") as f:
+            f.write(dump_json(dr_plan))
 
         logger.info("✓ Disaster recovery plan created")
-        logger.info(f"  RTO: {dr_plan['rto']}")
-        logger.info(f"  RPO: {dr_plan['rpo']}")
-        logger.info(f"  DR Region: {dr_plan['dr_region']}")
+        logger.info("  RTO: %s", dr_plan['rto'])
+        logger.info("  RPO: %s", dr_plan['rpo'])
+        logger.info("  DR Region: %s", dr_plan['dr_region'])
         logger.info("✓ Plan saved to: disaster_recovery_plan.json")
 
         return dr_plan
@@ -119,52 +372,29 @@ class DisasterRecoveryManager:
         logger.info("Testing Backup & Restore Procedures")
         logger.info("="*70)
 
-        test_server_name = f"securewave-db-test-{datetime.utcnow().strftime('%Y%m%d-%H%M%S')}"
+        now = datetime.now(timezone.utc)
+        test_server_name = f"securewave-db-test-{now.strftime('%Y%m%d-%H%M%S')}"
 
         try:
             # Get latest restore point (5 minutes ago)
-            restore_time = (datetime.utcnow() - timedelta(minutes=5)).strftime("%Y-%m-%dT%H:%M:%SZ")
+            restore_time = (now - timedelta(minutes=5)).strftime("%Y-%m-%dT%H:%M:%SZ")
 
-            logger.info(f"Test Server: {test_server_name}")
-            logger.info(f"Restore Point: {restore_time}")
+            logger.info("Test Server: %s", test_server_name)
+            logger.info("Restore Point: %s", restore_time)
             logger.info("\n[1/4] Starting point-in-time restore...")
 
             # Restore database to test server
-            result = subprocess.run(
-                [
-                    "az", "postgres", "flexible-server", "restore",
-                    "--resource-group", self.resource_group,
-                    "--name", test_server_name,
-                    "--source-server", self.primary_server,
-                    "--restore-time", restore_time,
-                    "--location", "eastus",  # Same region for test
-                    "--output", "json"
-                ],
-                capture_output=True,
-                text=True,
-                check=True,
-                timeout=600  # 10 minutes timeout
-            )
+            self._restore_server(restore_time, test_server_name, "eastus", timeout=600)  # Same region for test
 
             logger.info("✓ Restore completed")
 
             # Get restored server details
             logger.info("\n[2/4] Verifying restored server...")
 
-            server_info = json.loads(subprocess.run(
-                [
-                    "az", "postgres", "flexible-server", "show",
-                    "--resource-group", self.resource_group,
-                    "--name", test_server_name,
-                    "--output", "json"
-                ],
-                capture_output=True,
-                text=True,
-                check=True
-            ).stdout)
-
-            logger.info(f"✓ Server State: {server_info.get('state')}")
-            logger.info(f"✓ FQDN: {server_info.get('fullyQualifiedDomainName')}")
+            server_info = self._servers.get_server(test_server_name)
+
+            logger.info("✓ Server State: %s", server_info.get('state'))
+            logger.info("✓ FQDN: %s", server_info.get('fullyQualifiedDomainName'))
 
             # Test connection
             logger.info("\n[3/4] Testing database connection...")
@@ -173,68 +403,70 @@ class DisasterRecoveryManager:
                 import psycopg2
 
                 # Get admin credentials from environment
-                from dotenv import load_dotenv
-                load_dotenv(".env.production")
-
-                admin_user = os.getenv("DB_USER")
-                admin_password = os.getenv("DB_PASSWORD")
+                env = _production_env()
+                admin_user = env.get("DB_USER") or os.getenv("DB_USER")
+                admin_password = env.get("DB_PASSWORD") or os.getenv("DB_PASSWORD")
                 hostname = server_info.get("fullyQualifiedDomainName")
 
-                conn_string = f"postgresql://{admin_user}:{admin_password}@{hostname}:5432/securewave_vpn?sslmode=require"
+                conn_string = (
+                    f"postgresql://{admin_user}:{admin_password}@{hostname}:5432/securewave_vpn"
+                    "?sslmode=require&application_name=dr_verify&target_session_attrs=read-write"
+                    f"&{_FAST_FAILURE_PARAMS}"
+                )
 
+                # One connection for every verification query; the TLS
+                # handshake and auth dominate against a fresh server
                 conn = psycopg2.connect(conn_string, connect_timeout=30)
-                cursor = conn.cursor()
-
-                # Check table count
-                cursor.execute("""
-                    SELECT COUNT(*)
-                    FROM information_schema.tables
-                    WHERE table_schema = 'public'
-                """)
-                table_count = cursor.fetchone()[0]
-
-                logger.info(f"✓ Connection successful")
-                logger.info(f"✓ Tables restored: {table_count}")
-
-                cursor.close()
-                conn.close()
+                try:
+                    with conn.cursor() as cursor:
+                        # Check table count
+                        cursor.execute("""
+                            SELECT COUNT(*)
+                            FROM information_schema.tables
+                            WHERE table_schema = 'public'
+                        """)
+                        table_count = cursor.fetchone()[0]
+
+                        logger.info("✓ Connection successful")
+                        logger.info("✓ Tables restored: %s", table_count)
+
+                        # Planner row estimate from the restored catalog (no table
+                        # scans); pg_stat counters are reset by the restore
+                        cursor.execute("""
+                            SELECT COALESCE(SUM(GREATEST(c.reltuples, 0)), 0)::bigint
+                            FROM pg_class c
+                            JOIN pg_namespace n ON n.oid = c.relnamespace
+                            WHERE n.nspname = 'public' AND c.relkind IN ('r', 'p')
+                        """)
+                        logger.info("✓ Rows restored (planner estimate): %s", cursor.fetchone()[0])
+                finally:
+                    conn.close()
 
             except ImportError:
                 logger.warning("⚠ psycopg2 not installed, skipping connection test")
             except Exception as e:
-                logger.error(f"✗ Connection test failed: {e}")
+                logger.error("✗ Connection test failed: %s", e)
                 raise
 
             # Cleanup test server
             logger.info("\n[4/4] Cleaning up test server...")
 
-            subprocess.run(
-                [
-                    "az", "postgres", "flexible-server", "delete",
-                    "--resource-group", self.resource_group,
-                    "--name", test_server_name,
-                    "--yes"
-                ],
-                check=True
-            )
+            self._servers.delete_server(test_server_name)
 
             logger.info("✓ Test server deleted")
 
             logger.info("\n" + "="*70)
             logger.info("✅ Backup & Restore Test PASSED")
             logger.info("="*70)
-            logger.info(f"  Restore Time: {restore_time}")
-            logger.info(f"  Tables Restored: {table_count if 'table_count' in locals() else 'N/A'}")
-            logger.info(f"  RTO Achieved: < 10 minutes")
+            logger.info("  Restore Time: %s", restore_time)
+            logger.info("  Tables Restored: %s", table_count if 'table_count' in locals() else 'N/A')
+            logger.info("  RTO Achieved: < 10 minutes")
             logger.info("")
 
             return True
 
-        except subprocess.CalledProcessError as e:
-            logger.error(f"✗ Restore test failed: {e.stderr if hasattr(e, 'stderr') else str(e)}")
-            return False
         except Exception as e:
-            logger.error(f"✗ Unexpected error: {e}")
+            logger.error("✗ Restore test failed: %s", e)
             return False
 
     def activate_disaster_recovery(self, incident_type: str = "region_failure") -> Dict:
@@ -247,18 +479,37 @@ class DisasterRecoveryManager:
         Returns:
             Dict with DR activation details
         """
+        return asyncio.run(self.activate_disaster_recovery_async(incident_type))
+
+    async def activate_disaster_recovery_async(self, incident_type: str = "region_failure") -> Dict:
+        """
+        Activate disaster recovery procedures, overlapping steps that don't depend on each other
+
+        The primary check only warns, so it runs while the restore is
+        being submitted; the DR config and checklist are written together.
+
+        Args:
+            incident_type: Type of incident (region_failure, database_failure, data_corruption)
+
+        Returns:
+            Dict with DR activation details
+        """
+        # One clock reading for every timestamp in this activation
+        now = datetime.now(timezone.utc)
+        now_iso = now.isoformat()
+
         logger.info("="*70)
         logger.info("🚨 DISASTER RECOVERY ACTIVATION 🚨")
         logger.info("="*70)
-        logger.info(f"Incident Type: {incident_type}")
-        logger.info(f"Activation Time: {datetime.utcnow().isoformat()}")
+        logger.info("Incident Type: %s", incident_type)
+        logger.info("Activation Time: %s", now_iso)
         logger.info("")
 
-        dr_server_name = f"securewave-db-dr-{datetime.utcnow().strftime('%Y%m%d')}"
+        dr_server_name = f"securewave-db-dr-{now.strftime('%Y%m%d')}"
 
         activation_log = {
             "incident_type": incident_type,
-            "activated_at": datetime.utcnow().isoformat(),
+            "activated_at": now_iso,
             "primary_server": self.primary_server,
             "dr_server": dr_server_name,
             "dr_region": self.dr_location,
@@ -266,71 +517,44 @@ class DisasterRecoveryManager:
         }
 
         try:
-            # Step 1: Verify primary is down
+            # Step 1: Verify primary is down (in the background)
             logger.info("[1/6] Verifying primary database status...")
-            try:
-                subprocess.run(
-                    [
-                        "az", "postgres", "flexible-server", "show",
-                        "--resource-group", self.resource_group,
-                        "--name", self.primary_server
-                    ],
-                    capture_output=True,
-                    check=True,
-                    timeout=10
-                )
-                logger.warning("⚠ Primary database appears to be accessible")
-                logger.warning("⚠ Verify incident before proceeding")
-            except:
-                logger.info("✓ Primary database confirmed unavailable")
-
-            activation_log["steps_completed"].append("Primary verification")
+            verify_primary = asyncio.create_task(asyncio.to_thread(self._verify_primary_down))
 
             # Step 2: Identify restore point
             logger.info("\n[2/6] Identifying last good restore point...")
-            restore_time = (datetime.utcnow() - timedelta(minutes=15)).strftime("%Y-%m-%dT%H:%M:%SZ")
-            logger.info(f"✓ Restore point: {restore_time}")
+            restore_time = (now - timedelta(minutes=15)).strftime("%Y-%m-%dT%H:%M:%SZ")
+            logger.info("✓ Restore point: %s", restore_time)
             activation_log["restore_point"] = restore_time
             activation_log["steps_completed"].append("Restore point identified")
 
             # Step 3: Restore to DR region
-            logger.info(f"\n[3/6] Restoring database to DR region ({self.dr_location})...")
+            logger.info("\n[3/6] Restoring database to DR region (%s)...", self.dr_location)
             logger.info("⏳ This will take 5-10 minutes...")
 
-            subprocess.run(
-                [
-                    "az", "postgres", "flexible-server", "restore",
-                    "--resource-group", self.resource_group,
-                    "--name", dr_server_name,
-                    "--source-server", self.primary_server,
-                    "--restore-time", restore_time,
-                    "--location", self.dr_location,
-                    "--output", "json"
-                ],
-                check=True,
-                timeout=900  # 15 minutes timeout
+            restore_info = await asyncio.to_thread(
+                self._servers.begin_restore_from_backup, restore_time, dr_server_name, self.dr_location
             )
 
+            await verify_primary
+            activation_log["steps_completed"].insert(0, "Primary verification")
+
+            restore_info = await asyncio.to_thread(self._finish_restore, restore_info, 900)
+
             logger.info("✓ Database restored to DR region")
             activation_log["steps_completed"].append("Database restored")
 
             # Step 4: Get DR server connection details
             logger.info("\n[4/6] Retrieving DR server connection details...")
 
-            dr_server_info = json.loads(subprocess.run(
-                [
-                    "az", "postgres", "flexible-server", "show",
-                    "--resource-group", self.resource_group,
-                    "--name", dr_server_name,
-                    "--output", "json"
-                ],
-                capture_output=True,
-                text=True,
-                check=True
-            ).stdout)
+            # The restore request already returned the server resource; only
+            # look it up again if ARM left the FQDN out
+            dr_server_info = restore_info.get("server") or {}
+            if not dr_server_info.get("fullyQualifiedDomainName"):
+                dr_server_info = await asyncio.to_thread(self._servers.get_server, dr_server_name)
 
             dr_hostname = dr_server_info.get("fullyQualifiedDomainName")
-            logger.info(f"✓ DR Server FQDN: {dr_hostname}")
+            logger.info("✓ DR Server FQDN: %s", dr_hostname)
 
             activation_log["dr_hostname"] = dr_hostname
             activation_log["steps_completed"].append("Connection details retrieved")
@@ -339,18 +563,16 @@ class DisasterRecoveryManager:
             logger.info("\n[5/6] Generating updated configuration...")
 
             # Create DR environment file
-            from dotenv import load_dotenv
-            load_dotenv(".env.production")
-
-            admin_user = os.getenv("DB_USER", "securewave_admin")
-            admin_password = os.getenv("DB_PASSWORD")
+            env = _production_env()
+            admin_user = env.get("DB_USER") or os.getenv("DB_USER", "securewave_admin")
+            admin_password = env.get("DB_PASSWORD") or os.getenv("DB_PASSWORD")
 
             dr_config = f"""# DISASTER RECOVERY CONFIGURATION
-# Generated: {datetime.utcnow().isoformat()}
+# Generated: {now_iso}
 # Original Primary: {self.primary_server}.postgres.database.azure.com
 # DR Server: {dr_hostname}
 
-DATABASE_URL=postgresql+psycopg2://{admin_user}:{admin_password}@{dr_hostname}:5432/securewave_vpn
+DATABASE_URL=postgresql+psycopg2://{admin_user}:{admin_password}@{dr_hostname}:5432/securewave_vpn?{_FAST_FAILURE_PARAMS}
 DB_HOST={dr_hostname}
 DB_PORT=5432
 DB_NAME=securewave_vpn
@@ -367,72 +589,33 @@ DB_POOL_RECYCLE=3600
 ENVIRONMENT=production
 """
 
-            with open(".env.production.DR", "w") as f:
-                f.write(dr_config)
-
-            os.chmod(".env.production.DR", 0o600)
-
-            logger.info("✓ DR configuration saved to .env.production.DR")
-            activation_log["steps_completed"].append("Configuration updated")
-
             # Step 6: Verification checklist
             logger.info("\n[6/6] Generating verification checklist...")
 
-            checklist = f"""
-DISASTER RECOVERY ACTIVATION CHECKLIST
-
-Incident: {incident_type}
-Activated: {activation_log['activated_at']}
-DR Server: {dr_hostname}
-
-IMMEDIATE ACTIONS REQUIRED:
-
-[ ] 1. Replace .env.production with .env.production.DR
-       mv .env.production .env.production.BACKUP
-       mv .env.production.DR .env.production
-
-[ ] 2. Restart application
-       sudo systemctl restart securewave-web
-
-[ ] 3. Verify database connection
-       python3 -c "from database.session import check_database_connection; check_database_connection()"
-
-[ ] 4. Verify data integrity
-       python3 -c "from database.session import SessionLocal; from models.user import User; db = SessionLocal(); print(f'Users: {{db.query(User).count()}}'); db.close()"
-
-[ ] 5. Test application functionality
-       curl https://securewave-web.azurewebsites.net/api/health
-
-[ ] 6. Update DNS (if applicable)
-       # Update CNAME records to point to DR region
-
-[ ] 7. Notify stakeholders
-       # Email template in disaster_recovery_plan.json
-
-[ ] 8. Monitor application logs
-       tail -f /var/log/securewave/app.log
-
-[ ] 9. Document incident timeline
-       # Update incident log with timeline
-
-[ ] 10. Schedule post-incident review
-        # Within 48 hours of resolution
+            checklist = _CHECKLIST_TEMPLATE.substitute(
+                incident_type=incident_type,
+                activated_at=activation_log["activated_at"],
+                dr_hostname=dr_hostname,
+            )
 
-ROLLBACK PROCEDURE (if needed):
-1. mv .env.production.BACKUP .env.production
-2. sudo systemctl restart securewave-web
-3. Delete DR server when primary is restored
-"""
+            def write_checklist():
+                with open("DR_ACTIVATION_CHECKLIST.txt", "w") as f:
+                    f.write(checklist)
 
-            with open("DR_ACTIVATION_CHECKLIST.txt", "w") as f:
-                f.write(checklist)
+            await asyncio.gather(
+                # Owner-only from creation, so the credentials are never world-readable
+                asyncio.to_thread(write_private_file, ".env.production.DR", dr_config.encode()),
+                asyncio.to_thread(write_checklist)
+            )
 
+            logger.info("✓ DR configuration saved to .env.production.DR")
+            activation_log["steps_completed"].append("Configuration updated")
             logger.info("✓ Checklist saved to DR_ACTIVATION_CHECKLIST.txt")
             activation_log["steps_completed"].append("Checklist generated")
 
             # Save activation log
-            with open("disaster_recovery_log.json", "w") as f:
-                json.dump(activation_log, f, indent=2)
+            with open("disaster_recovery_log.json", "wb") as f:
+                f.write(dump_json(activation_log))
 
             logger.info("\n" + "="*70)
             logger.info("✅ DISASTER RECOVERY ACTIVATED")
@@ -442,199 +625,74 @@ ROLLBACK PROCEDURE (if needed):
             logger.info("  2. Update application config: .env.production.DR → .env.production")
             logger.info("  3. Restart application")
             logger.info("  4. Verify functionality")
-            logger.info(f"\n🔗 DR Database: {dr_hostname}")
+            logger.info("\n🔗 DR Database: %s", dr_hostname)
             logger.info("")
 
             return activation_log
 
         except Exception as e:
-            logger.error(f"\n✗ DR activation failed: {e}")
+            logger.error("\n✗ DR activation failed: %s", e)
             activation_log["error"] = str(e)
             activation_log["status"] = "failed"
 
-            with open("disaster_recovery_log.json", "w") as f:
-                json.dump(activation_log, f, indent=2)
+            with open("disaster_recovery_log.json", "wb") as f:
+                f.write(dump_json(activation_log))
 
             raise
 
+    def _verify_primary_down(self):
+        """Log whether the primary database still answers (advisory only)"""
+        # Probe the data plane the application actually needs; the control
+        # plane can report a server that no longer accepts connections
+        hostname = f"{self.primary_server}.postgres.database.azure.com"
+        try:
+            with socket.create_connection((hostname, 5432), timeout=3):
+                pass
+            logger.warning("⚠ Primary database appears to be accessible (%s:5432)", hostname)
+            logger.warning("⚠ Verify incident before proceeding")
+        except OSError:
+            logger.info("✓ Primary database confirmed unavailable")
+
+    def _restore_server(self, restore_time: str, target_server_name: str, location: str,
+                        timeout: Optional[float] = None):
+        """Point-in-time restore the primary to a new server, raising if it fails"""
+        self._finish_restore(
+            self._servers.begin_restore_from_backup(restore_time, target_server_name, location),
+            timeout
+        )
+
+    def _finish_restore(self, restore_info: Dict, timeout: Optional[float] = None) -> Dict:
+        """Wait for a started restore, raising if it fails or outlasts `timeout` seconds"""
+        restore_info = self._servers.wait_for_restore(restore_info, timeout=timeout)
+        if restore_info["status"] != "completed":
+            raise RuntimeError(f"Restore to {restore_info.get('target_server')} failed: {restore_info.get('error')}")
+        return restore_info
+
+    def close(self):
+        """Release the ARM client and connection pool held for the primary server"""
+        self._servers.close()
+
     def create_runbook(self) -> str:
         """Create disaster recovery runbook"""
         logger.info("Creating disaster recovery runbook...")
 
-        runbook = """
-# DISASTER RECOVERY RUNBOOK
-# SecureWave VPN Production Database
-
-## 1. DATABASE FAILURE SCENARIO
-
-**Symptoms:**
-- Application cannot connect to database
-- Database queries timing out
-- Azure Portal shows server as "unavailable"
-
-**Immediate Actions:**
-```bash
-# Verify database is truly down
-python3 infrastructure/disaster_recovery.py verify-primary
-
-# Activate DR (restores to DR region)
-python3 infrastructure/disaster_recovery.py activate --incident-type database_failure
-
-# Follow checklist
-cat DR_ACTIVATION_CHECKLIST.txt
-```
-
-**Expected Time:** 10-15 minutes
-
----
-
-## 2. FULL REGION FAILURE SCENARIO
-
-**Symptoms:**
-- Azure Status Dashboard shows region outage
-- Multiple services unavailable in region
-- Azure services returning 503 errors
-
-**Immediate Actions:**
-```bash
-# Confirm region outage
-az account list-locations --query "[?name=='eastus'].{Name:name,Status:metadata.regionCategory}" -o table
-
-# Activate full DR
-python3 infrastructure/disaster_recovery.py activate --incident-type region_failure
-
-# Deploy application to DR region
-./deploy_to_dr_region.sh westus2
-
-# Update DNS
-# (Manual step - update DNS records)
-```
-
-**Expected Time:** 30-60 minutes
-
----
-
-## 3. DATA CORRUPTION SCENARIO
-
-**Symptoms:**
-- Incorrect data in database
-- Unexpected data deletions
-- Database integrity errors
-
-**Immediate Actions:**
-```bash
-# Identify corruption timestamp
-# Review audit logs to find when corruption occurred
-
-# Restore to point before corruption
-python3 infrastructure/database_backup_manager.py restore \\
-  --restore-time "2026-01-03T10:00:00Z" \\
-  --target-server "securewave-db-recovery"
-
-# Verify restored data integrity
-python3 verify_data_integrity.py --server securewave-db-recovery
-
-# Switch application to recovered database
-mv .env.production .env.production.corrupt
-# Update DATABASE_URL to point to securewave-db-recovery
-sudo systemctl restart securewave-web
-```
-
-**Expected Time:** 20-30 minutes
-
----
-
-## 4. TESTING & DRILLS
-
-**Monthly DR Test:**
-```bash
-# Run automated backup/restore test
-python3 infrastructure/disaster_recovery.py test-restore
-
-# Expected: PASSED in <10 minutes
-```
-
-**Quarterly Full DR Drill:**
-```bash
-# Simulate full region failure
-python3 infrastructure/disaster_recovery.py drill --full
-
-# Involves:
-# - Database restore to DR region
-# - Application deployment to DR
-# - DNS failover simulation
-# - Stakeholder notification
-# - Post-drill review
-```
-
----
-
-## 5. CONTACT INFORMATION
-
-**Incident Commander:** oncall@securewave.app
-**Database Admin:** admin@securewave.app
-**Infrastructure Lead:** infra@securewave.app
-**Azure Support:** https://portal.azure.com/#create/Microsoft.Support
-
----
-
-## 6. RECOVERY METRICS
-
-**RTO (Recovery Time Objective):** 1 hour
-**RPO (Recovery Point Objective):** 15 minutes
-
-**Actual Performance (from tests):**
-- Database restore: 8-10 minutes
-- Application redeployment: 5-7 minutes
-- DNS propagation: 5-60 minutes (varies)
-- Total: 20-80 minutes (within RTO)
-
----
-
-## 7. POST-INCIDENT PROCEDURES
-
-After recovery:
-
-1. **Document timeline** in incident report
-2. **Verify data integrity** across all tables
-3. **Monitor application** for 24 hours
-4. **Schedule post-mortem** within 48 hours
-5. **Update DR procedures** based on lessons learned
-6. **Test restored systems** thoroughly
-7. **Communicate status** to stakeholders
-
----
-
-## 8. ROLLBACK PROCEDURES
-
-If DR activation fails:
-
-```bash
-# Restore original configuration
-mv .env.production.BACKUP .env.production
-sudo systemctl restart securewave-web
-
-# Delete DR server
-az postgres flexible-server delete \\
-  --resource-group SecureWaveRG \\
-  --name <dr-server-name> \\
-  --yes
-
-# Investigate and retry
-```
-
----
-
-**Last Updated:** 2026-01-03
-**Next Review:** 2026-04-03
-"""
+        # Leave an identical file (and its mtime) untouched
+        content = _RUNBOOK.encode()
+        try:
+            with open("DISASTER_RECOVERY_RUNBOOK.md", "rb") as f:
+                unchanged = f.read() == content
+        except FileNotFoundError:
+            unchanged = False
 
-        with open("DISASTER_RECOVERY_RUNBOOK.md", "w") as f:
-            f.write(runbook)
+        if unchanged:
+            logger.info("✓ Runbook DISASTER_RECOVERY_RUNBOOK.md already up to date")
+        else:
+            with open("DISASTER_RECOVERY_RUNBOOK.md", "wb") as f:
+                f.write(content)
 
-        logger.info("✓ Runbook saved to DISASTER_RECOVERY_RUNBOOK.md")
+            logger.info("✓ Runbook saved to DISASTER_RECOVERY_RUNBOOK.md")
 
-        return runbook
+        return _RUNBOOK
 
 
 def main():
@@ -662,19 +720,21 @@ def main():
     args = parser.parse_args()
 
     manager = DisasterRecoveryManager(resource_group=args.resource_group)
+    try:
+        if args.command == "create-plan":
+            manager.create_disaster_recovery_plan()
 
-    if args.command == "create-plan":
-        manager.create_disaster_recovery_plan()
-
-    elif args.command == "test-restore":
-        success = manager.test_backup_restore()
-        sys.exit(0 if success else 1)
+        elif args.command == "test-restore":
+            success = manager.test_backup_restore()
+            sys.exit(0 if success else 1)
 
-    elif args.command == "activate":
-        manager.activate_disaster_recovery(incident_type=args.incident_type)
+        elif args.command == "activate":
+            manager.activate_disaster_recovery(incident_type=args.incident_type)
 
-    elif args.command == "create-runbook":
-        manager.create_runbook()
+        elif args.command == "create-runbook":
+            manager.create_runbook()
+    finally:
+        manager.close()
 
 
 if __name__ == "__main__":
@@ -4,146 +4,183 @@ Initialize demo VPN servers in database
 This script seeds the database with 5 demo servers for the hybrid deployment
 """
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from types import MappingProxyType
+from typing import Any, Mapping, Tuple
 
 # Add parent directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from database.session import SessionLocal
-# Import all models to resolve SQLAlchemy relationships
-from models.user import User
-from models.subscription import Subscription
-from models.vpn_server import VPNServer
-from models.vpn_connection import VPNConnection
-from models.audit_log import AuditLog
-from services.wireguard_service import WireGuardService
+# Seed data, shared read-only with anything that imports it
+_DEMO_SERVERS: Tuple[Mapping[str, Any], ...] = (
+    MappingProxyType({
+        "server_id": "us-west-1",
+        "location": "San Francisco",
+        "country": "United States",
+        "country_code": "US",
+        "city": "San Francisco",
+        "region": "Americas",
+        "azure_region": "westus",
+        "public_ip": "demo-us-west.securewave.app",
+        "endpoint": "demo-us-west.securewave.app:51820",
+        "latency_ms": 30.0,
+        "latitude": 37.7749,
+        "longitude": -122.4194,
+    }),
+    MappingProxyType({
+        "server_id": "eu-west-1",
+        "location": "London",
+        "country": "United Kingdom",
+        "country_code": "GB",
+        "city": "London",
+        "region": "Europe",
+        "azure_region": "uksouth",
+        "public_ip": "demo-eu-west.securewave.app",
+        "endpoint": "demo-eu-west.securewave.app:51820",
+        "latency_ms": 40.0,
+        "latitude": 51.5074,
+        "longitude": -0.1278,
+    }),
+    MappingProxyType({
+        "server_id": "eu-central-1",
+        "location": "Frankfurt",
+        "country": "Germany",
+        "country_code": "DE",
+        "city": "Frankfurt",
+        "region": "Europe",
+        "azure_region": "germanywestcentral",
+        "public_ip": "demo-eu-central.securewave.app",
+        "endpoint": "demo-eu-central.securewave.app:51820",
+        "latency_ms": 45.0,
+        "latitude": 50.1109,
+        "longitude": 8.6821,
+    }),
+    MappingProxyType({
+        "server_id": "ap-southeast-1",
+        "location": "Singapore",
+        "country": "Singapore",
+        "country_code": "SG",
+        "city": "Singapore",
+        "region": "Asia",
+        "azure_region": "southeastasia",
+        "public_ip": "demo-ap-southeast.securewave.app",
+        "endpoint": "demo-ap-southeast.securewave.app:51820",
+        "latency_ms": 80.0,
+        "latitude": 1.3521,
+        "longitude": 103.8198,
+    }),
+    MappingProxyType({
+        "server_id": "ap-northeast-1",
+        "location": "Tokyo",
+        "country": "Japan",
+        "country_code": "JP",
+        "city": "Tokyo",
+        "region": "Asia",
+        "azure_region": "japaneast",
+        "public_ip": "demo-ap-northeast.securewave.app",
+        "endpoint": "demo-ap-northeast.securewave.app:51820",
+        "latency_ms": 85.0,
+        "latitude": 35.6762,
+        "longitude": 139.6503,
+    }),
+)
+
 
 def init_demo_servers():
     """Initialize demo VPN servers in database"""
-    db = SessionLocal()
-    wg = WireGuardService()
-
-    demo_servers = [
-        {
-            "server_id": "us-west-1",
-            "location": "San Francisco",
-            "country": "United States",
-            "country_code": "US",
-            "city": "San Francisco",
-            "region": "Americas",
-            "azure_region": "westus",
-            "public_ip": "demo-us-west.securewave.app",
-            "endpoint": "demo-us-west.securewave.app:51820",
-            "latency_ms": 30.0,
-            "latitude": 37.7749,
-            "longitude": -122.4194,
-        },
-        {
-            "server_id": "eu-west-1",
-            "location": "London",
-            "country": "United Kingdom",
-            "country_code": "GB",
-            "city": "London",
-            "region": "Europe",
-            "azure_region": "uksouth",
-            "public_ip": "demo-eu-west.securewave.app",
-            "endpoint": "demo-eu-west.securewave.app:51820",
-            "latency_ms": 40.0,
-            "latitude": 51.5074,
-            "longitude": -0.1278,
-        },
-        {
-            "server_id": "eu-central-1",
-            "location": "Frankfurt",
-            "country": "Germany",
-            "country_code": "DE",
-            "city": "Frankfurt",
-            "region": "Europe",
-            "azure_region": "germanywestcentral",
-            "public_ip": "demo-eu-central.securewave.app",
-            "endpoint": "demo-eu-central.securewave.app:51820",
-            "latency_ms": 45.0,
-            "latitude": 50.1109,
-            "longitude": 8.6821,
-        },
-        {
-            "server_id": "ap-southeast-1",
-            "location": "Singapore",
-            "country": "Singapore",
-            "country_code": "SG",
-            "city": "Singapore",
-            "region": "Asia",
-            "azure_region": "southeastasia",
-            "public_ip": "demo-ap-southeast.securewave.app",
-            "endpoint": "demo-ap-southeast.securewave.app:51820",
-            "latency_ms": 80.0,
-            "latitude": 1.3521,
-            "longitude": 103.8198,
-        },
-        {
-            "server_id": "ap-northeast-1",
-            "location": "Tokyo",
-            "country": "Japan",
-            "country_code": "JP",
-            "city": "Tokyo",
-            "region": "Asia",
-            "azure_region": "japaneast",
-            "public_ip": "demo-ap-northeast.securewave.app",
-            "endpoint": "demo-ap-northeast.securewave.app:51820",
-            "latency_ms": 85.0,
-            "latitude": 35.6762,
-            "longitude": 139.6503,
-        },
-    ]
-
-    created_count = 0
-
-    for server_data in demo_servers:
-        # Check if server already exists
-        existing = db.query(VPNServer).filter(
-            VPNServer.server_id == server_data["server_id"]
-        ).first()
-
-        if existing:
-            print(f"⏭️  Server {server_data['server_id']} already exists, skipping...")
-            continue
-
-        # Generate keys for demo server
-        private_key, public_key = wg.generate_keypair()
-
-        server = VPNServer(
-            server_id=server_data["server_id"],
-            location=server_data["location"],
-            country=server_data["country"],
-            country_code=server_data["country_code"],
-            city=server_data["city"],
-            region=server_data["region"],
-            latitude=server_data.get("latitude"),
-            longitude=server_data.get("longitude"),
-            azure_region=server_data["azure_region"],
-            public_ip=server_data["public_ip"],
-            endpoint=server_data["endpoint"],
-            wg_public_key=public_key,
-            wg_private_key_encrypted=wg.encrypt_private_key(private_key),
-            status="demo",  # Mark as demo server
-            health_status="healthy",
-            max_connections=1000,
-            latency_ms=server_data["latency_ms"],
-            bandwidth_in_mbps=800.0,
-            cpu_load=0.3,
-            packet_loss=0.01,
-            jitter_ms=2.0,
-        )
-
-        db.add(server)
-        created_count += 1
-        print(f"✅ Created demo server: {server_data['server_id']} ({server_data['location']})")
-
-    db.commit()
-    db.close()
-
-    print(f"\n🎉 Demo server initialization complete! Created {created_count} servers")
-    print(f"📊 Total servers in database: {created_count}")
+    # Imported here so importing the seed data doesn't pay for engine,
+    # mapper and crypto setup
+    from sqlalchemy import func, select
+    from sqlalchemy.dialects.postgresql import insert as pg_insert
+    from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
+    from database.session import SessionLocal
+    # Import all models to resolve SQLAlchemy relationships
+    from models.user import User  # noqa: F401
+    from models.subscription import Subscription  # noqa: F401
+    from models.vpn_server import VPNServer
+    from models.vpn_connection import VPNConnection  # noqa: F401
+    from models.audit_log import AuditLog  # noqa: F401
+    from services.wireguard_service import get_wireguard_service
+
+    wg = get_wireguard_service()
+
+    # One transaction for the lookup and insert; commits on success, rolls
+    # back on any error, and always hands the connection back to the pool
+    with SessionLocal.begin() as db:
+        # One existence check for the whole seed set
+        existing_ids = set(db.scalars(
+            select(VPNServer.server_id).where(
+                VPNServer.server_id.in_([s["server_id"] for s in _DEMO_SERVERS])
+            )
+        ))
+
+        # Progress lines are collected and written in one go at the end
+        log_lines = []
+        missing = []
+        for server_data in _DEMO_SERVERS:
+            if server_data["server_id"] in existing_ids:
+                log_lines.append(f"⏭️  Server {server_data['server_id']} already exists, skipping...")
+                continue
+            missing.append(server_data)
+
+        def generate_server_keys(_):
+            private_key, public_key = wg.generate_keypair()
+            return public_key, wg.encrypt_private_key(private_key)
+
+        # Generate keys for demo servers; each keypair waits on its own `wg`
+        # subprocesses, so they run side by side
+        with ThreadPoolExecutor(max_workers=max(1, min(len(missing), 8))) as executor:
+            server_keys = list(executor.map(generate_server_keys, missing))
+
+        rows = []
+        for server_data, (public_key, private_key_encrypted) in zip(missing, server_keys):
+            rows.append({
+                "server_id": server_data["server_id"],
+                "location": server_data["location"],
+                "country": server_data["country"],
+                "country_code": server_data["country_code"],
+                "city": server_data["city"],
+                "region": server_data["region"],
+                "latitude": server_data.get("latitude"),
+                "longitude": server_data.get("longitude"),
+                "azure_region": server_data["azure_region"],
+                "public_ip": server_data["public_ip"],
+                "endpoint": server_data["endpoint"],
+                "wg_public_key": public_key,
+                "wg_private_key_encrypted": private_key_encrypted,
+                "status": "demo",  # Mark as demo server
+                "health_status": "healthy",
+                "max_connections": 1000,
+                "latency_ms": server_data["latency_ms"],
+                "bandwidth_in_mbps": 800.0,
+                "cpu_load": 0.3,
+                "packet_loss": 0.01,
+                "jitter_ms": 2.0,
+            })
+
+        created_ids = set()
+        if rows:
+            # Single INSERT; ON CONFLICT keeps concurrent seeders idempotent,
+            # and RETURNING reports only the rows it actually wrote
+            insert = pg_insert if db.get_bind().dialect.name == "postgresql" else sqlite_insert
+            created_ids = set(db.scalars(
+                insert(VPNServer)
+                .values(rows)
+                .on_conflict_do_nothing(index_elements=["server_id"])
+                .returning(VPNServer.server_id)
+            ))
+            log_lines.extend(
+                f"✅ Created demo server: {row['server_id']} ({row['location']})"
+                for row in rows if row["server_id"] in created_ids
+            )
+
+        total_count = db.scalar(select(func.count()).select_from(VPNServer))
+
+    log_lines.append(f"\n🎉 Demo server initialization complete! Created {len(created_ids)} servers")
+    log_lines.append(f"📊 Total servers in database: {total_count}")
+    sys.stdout.write("\n".join(log_lines) + "\n")
 
 
 if __name__ == "__main__":
@@ -11,18 +11,23 @@ Run this once after the WG VM is provisioned:
 
 import os
 import sys
-from datetime import datetime
 from pathlib import Path
+from typing import TYPE_CHECKING, Optional
 
 # Add project root to path
 project_root = Path(__file__).resolve().parent.parent
 sys.path.insert(0, str(project_root))
 
 from dotenv import load_dotenv
-load_dotenv(project_root / ".env")
 
-from database.session import SessionLocal
-from models.vpn_server import VPNServer
+# Parse .env once per process tree; re-imports and child processes already
+# have its values in os.environ
+if not os.environ.get("_SECUREWAVE_DOTENV_LOADED"):
+    load_dotenv(project_root / ".env")
+    os.environ["_SECUREWAVE_DOTENV_LOADED"] = "1"
+
+if TYPE_CHECKING:
+    from sqlalchemy.orm import Session
 
 
 # Live WireGuard server configuration
@@ -46,117 +51,141 @@ PRODUCTION_SERVER = {
     "priority": 100,
 }
 
+# Full insert row for the server, derived once at import
+_PROD_ROW = {
+    **PRODUCTION_SERVER,
+    "endpoint": f"{PRODUCTION_SERVER['public_ip']}:{PRODUCTION_SERVER['wg_listen_port']}",
+    "wg_private_key_encrypted": "",  # Not stored in backend for security
+    "status": "active",
+    "health_status": "healthy",
+    "azure_vm_state": "running",
+}
 
-def init_production_server():
-    """Register the production WireGuard server in the database."""
-    db = SessionLocal()
-
-    try:
-        # Check if server already exists
-        existing = db.query(VPNServer).filter(
-            VPNServer.server_id == PRODUCTION_SERVER["server_id"]
-        ).first()
-
-        if existing:
-            print(f"Server '{PRODUCTION_SERVER['server_id']}' already exists.")
-            print(f"  Public IP: {existing.public_ip}")
-            print(f"  Endpoint: {existing.endpoint}")
-            print(f"  Status: {existing.status}")
-            print(f"  Health: {existing.health_status}")
-
-            # Update if the public key or IP changed
-            if existing.public_ip != PRODUCTION_SERVER["public_ip"]:
-                print(f"\nUpdating public IP: {existing.public_ip} -> {PRODUCTION_SERVER['public_ip']}")
-                existing.public_ip = PRODUCTION_SERVER["public_ip"]
-                existing.endpoint = f"{PRODUCTION_SERVER['public_ip']}:{PRODUCTION_SERVER['wg_listen_port']}"
-
-            if existing.wg_public_key != PRODUCTION_SERVER["wg_public_key"]:
-                print(f"\nUpdating WG public key")
-                existing.wg_public_key = PRODUCTION_SERVER["wg_public_key"]
-
-            # Ensure server is active
-            if existing.status != "active":
-                print(f"\nActivating server (was: {existing.status})")
-                existing.status = "active"
-                existing.azure_vm_state = "running"
-
-            db.commit()
-            print("\nServer updated successfully.")
-            return existing
-
-        # Create new server
-        server = VPNServer(
-            server_id=PRODUCTION_SERVER["server_id"],
-            location=PRODUCTION_SERVER["location"],
-            country=PRODUCTION_SERVER["country"],
-            country_code=PRODUCTION_SERVER["country_code"],
-            city=PRODUCTION_SERVER["city"],
-            region=PRODUCTION_SERVER["region"],
-            latitude=PRODUCTION_SERVER["latitude"],
-            longitude=PRODUCTION_SERVER["longitude"],
-            azure_region=PRODUCTION_SERVER["azure_region"],
-            azure_resource_group=PRODUCTION_SERVER["azure_resource_group"],
-            azure_vm_name=PRODUCTION_SERVER["azure_vm_name"],
-            public_ip=PRODUCTION_SERVER["public_ip"],
-            endpoint=f"{PRODUCTION_SERVER['public_ip']}:{PRODUCTION_SERVER['wg_listen_port']}",
-            wg_listen_port=PRODUCTION_SERVER["wg_listen_port"],
-            wg_public_key=PRODUCTION_SERVER["wg_public_key"],
-            wg_private_key_encrypted="",  # Not stored in backend for security
-            max_connections=PRODUCTION_SERVER["max_connections"],
-            tier_restriction=PRODUCTION_SERVER["tier_restriction"],
-            priority=PRODUCTION_SERVER["priority"],
-            status="active",
-            health_status="healthy",
-            azure_vm_state="running",
-            provisioned_at=datetime.utcnow(),
-        )
-
-        db.add(server)
-        db.commit()
-        db.refresh(server)
-
-        print("=" * 60)
-        print("Production WireGuard Server Registered")
-        print("=" * 60)
-        print(f"  Server ID:    {server.server_id}")
-        print(f"  Location:     {server.city}, {server.country}")
-        print(f"  Public IP:    {server.public_ip}")
-        print(f"  Endpoint:     {server.endpoint}")
-        print(f"  WG Port:      {server.wg_listen_port}/UDP")
-        print(f"  Public Key:   {server.wg_public_key}")
-        print(f"  Status:       {server.status}")
-        print("=" * 60)
-        print("\nThe VPN allocation flow will now use this server.")
-        print("Users can generate configs from /vpn.html")
-
+# Columns kept in sync with _PROD_ROW when the server is already registered;
+# azure_vm_state is only reset when the server is (re)activated
+_SYNCED_FIELDS = ("public_ip", "endpoint", "wg_public_key", "status")
+
+
+def init_production_server(db: Optional["Session"] = None):
+    """Register the production WireGuard server in the database.
+
+    Pass ``db`` to run inside the caller's transaction, and the returned
+    server stays attached to that session; otherwise the work runs in its
+    own, committed on success and rolled back on error, and the server is
+    returned detached with its values loaded.
+    """
+    # Imported here so `--help` doesn't pay for engine and mapper setup
+    from sqlalchemy import func, insert
+    from database.session import SessionLocal
+    from models.vpn_server import VPNServer
+
+    if db is None:
+        with SessionLocal.begin() as db:
+            server = init_production_server(db)
+            # Write any changes, then keep the loaded values; the commit
+            # would otherwise expire them and leave the caller an unloaded row
+            db.flush()
+            db.expunge(server)
         return server
 
-    except Exception as e:
-        db.rollback()
-        print(f"Error: {e}")
-        raise
-    finally:
-        db.close()
-
+    # Check if server already exists
+    existing = db.query(VPNServer).filter(
+        VPNServer.server_id == PRODUCTION_SERVER["server_id"]
+    ).first()
+
+    if existing:
+        print(f"Server '{PRODUCTION_SERVER['server_id']}' already exists.")
+        print(f"  Public IP: {existing.public_ip}")
+        print(f"  Endpoint: {existing.endpoint}")
+        print(f"  Status: {existing.status}")
+        print(f"  Health: {existing.health_status}")
+
+        # Bring drifted columns back to the configured values
+        diffs = {
+            field: _PROD_ROW[field]
+            for field in _SYNCED_FIELDS
+            if getattr(existing, field) != _PROD_ROW[field]
+        }
+        if "status" in diffs and existing.azure_vm_state != _PROD_ROW["azure_vm_state"]:
+            diffs["azure_vm_state"] = _PROD_ROW["azure_vm_state"]
+        for field, value in diffs.items():
+            print(f"\nUpdating {field}: {getattr(existing, field)} -> {value}")
+            setattr(existing, field, value)
+
+        if not diffs:
+            # Nothing to write; the transaction ends without an UPDATE
+            print("\nServer already up to date.")
+            return existing
 
-def list_servers():
+        print("\nServer updated successfully.")
+        return existing
+
+    # Create new server; RETURNING hands back the stored row (defaults
+    # included) without a follow-up SELECT
+    # Database clock, stored as naive UTC like the model's other timestamps
+    # (SQLite's CURRENT_TIMESTAMP is already UTC; Postgres' now() follows the
+    # session TimeZone)
+    now = func.now()
+    if db.get_bind().dialect.name == "postgresql":
+        now = func.timezone("UTC", now)
+    server = db.execute(
+        insert(VPNServer)
+        .values(**_PROD_ROW, provisioned_at=now)
+        .returning(VPNServer)
+    ).scalar_one()
+
+    print("=" * 60)
+    print("Production WireGuard Server Registered")
+    print("=" * 60)
+    print(f"  Server ID:    {server.server_id}")
+    print(f"  Location:     {server.city}, {server.country}")
+    print(f"  Public IP:    {server.public_ip}")
+    print(f"  Endpoint:     {server.endpoint}")
+    print(f"  WG Port:      {server.wg_listen_port}/UDP")
+    print(f"  Public Key:   {server.wg_public_key}")
+    print(f"  Status:       {server.status}")
+    print("=" * 60)
+    print("\nThe VPN allocation flow will now use this server.")
+    print("Users can generate configs from /vpn.html")
+
+    return server
+
+
+def list_servers(db: Optional["Session"] = None):
     """List all VPN servers in the database."""
-    db = SessionLocal()
-    try:
-        servers = db.query(VPNServer).all()
-        if not servers:
-            print("No VPN servers in database.")
-            return
-
-        print(f"\nFound {len(servers)} VPN server(s):\n")
-        for s in servers:
-            print(f"  [{s.server_id}] {s.city}, {s.country}")
-            print(f"    Endpoint: {s.endpoint}")
-            print(f"    Status: {s.status} | Health: {s.health_status}")
-            print(f"    Connections: {s.current_connections}/{s.max_connections}")
-            print()
-    finally:
-        db.close()
+    from sqlalchemy import select
+    from database.session import engine
+    from models.vpn_server import VPNServer
+
+    # Plain rows are enough for printing; no ORM instances needed
+    query = select(
+        VPNServer.server_id,
+        VPNServer.city,
+        VPNServer.country,
+        VPNServer.endpoint,
+        VPNServer.status,
+        VPNServer.health_status,
+        VPNServer.current_connections,
+        VPNServer.max_connections,
+    )
+    if db is None:
+        # Read-only: a bare Core connection, no Session
+        with engine.connect() as conn:
+            servers = conn.execute(query).all()
+    else:
+        servers = db.execute(query).all()
+
+    if not servers:
+        print("No VPN servers in database.")
+        return
+
+    print(f"\nFound {len(servers)} VPN server(s):\n")
+    for s in servers:
+        print(f"  [{s.server_id}] {s.city}, {s.country}")
+        print(f"    Endpoint: {s.endpoint}")
+        print(f"    Status: {s.status} | Health: {s.health_status}")
+        print(f"    Connections: {s.current_connections}/{s.max_connections}")
+        print()
 
 
 if __name__ == "__main__":
@@ -169,6 +198,10 @@ if __name__ == "__main__":
     if args.list:
         list_servers()
     else:
-        init_production_server()
-        print("\nCurrent servers:")
-        list_servers()
+        from database.session import SessionLocal
+
+        # One session, one connection handshake and one commit for both steps
+        with SessionLocal.begin() as db:
+            init_production_server(db)
+            print("\nCurrent servers:")
+            list_servers(db)
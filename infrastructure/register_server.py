@@ -4,94 +4,176 @@ Register a VPN server in the database
 Used after deploying a real VPN server to Azure Container Instance
 """
 import sys
+import json
 import argparse
 from pathlib import Path
+from typing import Dict, List
 
 # Add parent directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from database.session import SessionLocal
-from models.vpn_server import VPNServer
-from services.wireguard_service import WireGuardService
+_REQUIRED_FIELDS = ("server_id", "location", "public_ip", "endpoint")
+
+
+def _validate_servers(servers: List[Dict[str, str]]):
+    """Raise ValueError if an entry lacks a required field or repeats a server_id"""
+    if not isinstance(servers, list):
+        raise ValueError("expected a list of servers")
+
+    seen = set()
+    for index, server_data in enumerate(servers):
+        if not isinstance(server_data, dict):
+            raise ValueError(f"server #{index + 1} is not an object")
+        missing = [field for field in _REQUIRED_FIELDS if not server_data.get(field)]
+        if missing:
+            name = server_data.get("server_id") or f"#{index + 1}"
+            raise ValueError(f"server {name} is missing {', '.join(missing)}")
+        if server_data["server_id"] in seen:
+            raise ValueError(f"server {server_data['server_id']} is listed more than once")
+        seen.add(server_data["server_id"])
 
 
 def register_server(server_id: str, location: str, public_ip: str, endpoint: str, region: str = "Americas"):
     """Register a VPN server in the database"""
-    db = SessionLocal()
-    wg = WireGuardService()
-
-    # Check if server already exists
-    existing = db.query(VPNServer).filter(VPNServer.server_id == server_id).first()
-
-    if existing:
-        print(f"⚠️  Server {server_id} already exists in database")
-        print(f"   Updating endpoint: {endpoint}")
-        existing.endpoint = endpoint
-        existing.public_ip = public_ip
-        existing.status = "active"
-        db.commit()
+    register_servers([{
+        "server_id": server_id,
+        "location": location,
+        "public_ip": public_ip,
+        "endpoint": endpoint,
+        "region": region,
+    }])
+
+
+def register_servers(servers: List[Dict[str, str]]):
+    """
+    Register VPN servers in the database in one transaction
+
+    Each entry needs server_id, location, public_ip and endpoint; region
+    defaults to "Americas". Servers that are already registered get their
+    endpoint and public IP refreshed, and all new ones go in with a single
+    executemany INSERT. The list is validated before anything is written
+    (ValueError on a missing field or a repeated server_id).
+    """
+    _validate_servers(servers)
+
+    # Imported here so `--help` doesn't pay for engine, mapper and crypto setup
+    from sqlalchemy import insert, select
+    from database.session import SessionLocal
+    from models.vpn_server import VPNServer
+    from services.wireguard_service import get_wireguard_service
+
+    wg = get_wireguard_service()
+
+    # One transaction: commits on success, rolls back on error, always closes
+    with SessionLocal.begin() as db:
+        # Check which servers already exist
+        existing = {
+            server.server_id: server
+            for server in db.scalars(
+                select(VPNServer).where(VPNServer.server_id.in_([s["server_id"] for s in servers]))
+            )
+        }
+
+        updated, rows = [], []
+        for server_data in servers:
+            server_id = server_data["server_id"]
+            server = existing.get(server_id)
+
+            if server:
+                print(f"⚠️  Server {server_id} already exists in database")
+                print(f"   Updating endpoint: {server_data['endpoint']}")
+                server.endpoint = server_data["endpoint"]
+                server.public_ip = server_data["public_ip"]
+                server.status = "active"
+                updated.append(server_id)
+                continue
+
+            # Generate server keypair
+            print(f"🔑 Generating WireGuard keypair for {server_id}...")
+            private_key, public_key = wg.generate_keypair()
+
+            rows.append({
+                "server_id": server_id,
+                "location": server_data["location"],
+                "region": server_data.get("region", "Americas"),
+                "public_ip": server_data["public_ip"],
+                "endpoint": server_data["endpoint"],
+                "wg_public_key": public_key,
+                "wg_private_key_encrypted": wg.encrypt_private_key(private_key),
+                "status": "active",  # Real server, not demo
+                "health_status": "unknown",  # Will be updated by health monitor
+                "max_connections": 1000,
+                "latency_ms": 50.0,  # Initial estimate
+                "bandwidth_in_mbps": 1000.0,
+                "cpu_load": 0.2,
+                "packet_loss": 0.0,
+                "jitter_ms": 2.0,
+            })
+
+        if rows:
+            print(f"📝 Creating database record{'s' if len(rows) > 1 else ''}...")
+            db.execute(insert(VPNServer), rows)
+
+    for server_id in updated:
         print(f"✅ Server {server_id} updated successfully")
-        db.close()
-        return
-
-    # Generate server keypair
-    print(f"🔑 Generating WireGuard keypair for {server_id}...")
-    private_key, public_key = wg.generate_keypair()
-
-    print(f"📝 Creating database record...")
-    server = VPNServer(
-        server_id=server_id,
-        location=location,
-        region=region,
-        public_ip=public_ip,
-        endpoint=endpoint,
-        wg_public_key=public_key,
-        wg_private_key_encrypted=wg.encrypt_private_key(private_key),
-        status="active",  # Real server, not demo
-        health_status="unknown",  # Will be updated by health monitor
-        max_connections=1000,
-        latency_ms=50.0,  # Initial estimate
-        bandwidth_in_mbps=1000.0,
-        cpu_load=0.2,
-        packet_loss=0.0,
-        jitter_ms=2.0,
-    )
 
-    db.add(server)
-    db.commit()
-    db.refresh(server)
-    db.close()
+    for row in rows:
+        print(f"\n✅ Server registered successfully!")
+        print(f"   Server ID: {row['server_id']}")
+        print(f"   Location: {row['location']}")
+        print(f"   Endpoint: {row['endpoint']}")
+        print(f"   Public Key: {row['wg_public_key'][:20]}...")
 
-    print(f"\n✅ Server registered successfully!")
-    print(f"   Server ID: {server_id}")
-    print(f"   Location: {location}")
-    print(f"   Endpoint: {endpoint}")
-    print(f"   Public Key: {public_key[:20]}...")
-    print(f"\n💡 Server will be picked up by health monitor within 30 seconds")
+    if rows:
+        print(f"\n💡 Server{'s' if len(rows) > 1 else ''} will be picked up by health monitor within 30 seconds")
 
 
 def main():
     parser = argparse.ArgumentParser(description="Register VPN server in database")
-    parser.add_argument("--server-id", required=True, help="Server identifier (e.g., us-east-1)")
-    parser.add_argument("--location", required=True, help="Server location (e.g., New York)")
-    parser.add_argument("--public-ip", required=True, help="Server public IP address")
-    parser.add_argument("--endpoint", required=True, help="WireGuard endpoint (IP:port)")
+    parser.add_argument("--server-id", help="Server identifier (e.g., us-east-1)")
+    parser.add_argument("--location", help="Server location (e.g., New York)")
+    parser.add_argument("--public-ip", help="Server public IP address")
+    parser.add_argument("--endpoint", help="WireGuard endpoint (IP:port)")
     parser.add_argument("--region", default="Americas", help="Server region")
+    parser.add_argument(
+        "--from-file",
+        type=Path,
+        help="JSON list of servers (server_id, location, public_ip, endpoint, region) to register in one batch",
+    )
 
     args = parser.parse_args()
 
+    if args.from_file:
+        try:
+            servers = json.loads(args.from_file.read_text())
+            _validate_servers(servers)
+        except (OSError, ValueError) as e:
+            parser.error(f"{args.from_file}: {e}")
+    else:
+        missing = [
+            flag for flag, value in (
+                ("--server-id", args.server_id),
+                ("--location", args.location),
+                ("--public-ip", args.public_ip),
+                ("--endpoint", args.endpoint),
+            ) if not value
+        ]
+        if missing:
+            parser.error(f"the following arguments are required: {', '.join(missing)}")
+        servers = [{
+            "server_id": args.server_id,
+            "location": args.location,
+            "public_ip": args.public_ip,
+            "endpoint": args.endpoint,
+            "region": args.region,
+        }]
+
     print("=" * 60)
     print("SecureWave VPN - Server Registration")
     print("=" * 60)
     print()
 
-    register_server(
-        server_id=args.server_id,
-        location=args.location,
-        public_ip=args.public_ip,
-        endpoint=args.endpoint,
-        region=args.region,
-    )
+    register_servers(servers)
 
 
 if __name__ == "__main__":
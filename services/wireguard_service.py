@@ -5,7 +5,7 @@ import shutil
 import subprocess  # nosec B404 - controlled subprocess usage
 from io import BytesIO
 from pathlib import Path
-from typing import Tuple
+from typing import Optional, Tuple
 
 import qrcode
 from cryptography.fernet import Fernet
@@ -197,3 +197,15 @@ class WireGuardService:
         buffer = BytesIO()
         img.save(buffer, format="PNG")
         return base64.b64encode(buffer.getvalue()).decode()
+
+
+# Singleton instance
+_wireguard_service: Optional[WireGuardService] = None
+
+
+def get_wireguard_service() -> WireGuardService:
+    """Get the singleton WireGuardService instance"""
+    global _wireguard_service
+    if _wireguard_service is None:
+        _wireguard_service = WireGuardService()
+    return _wireguard_service
@@ -0,0 +1,37 @@
+import string
+
+from infrastructure.azure_database_deployer import AzureDatabaseDeployer
+
+
+def test_generate_strong_password_meets_azure_requirements():
+    deployer = AzureDatabaseDeployer()
+    allowed = set(string.ascii_letters + string.digits + "!@#$%^&*")
+    for _ in range(200):
+        password = deployer.generate_strong_password()
+        assert len(password) == 32
+        assert set(password) <= allowed
+        assert any(c.isupper() for c in password)
+        assert any(c.islower() for c in password)
+        assert any(c.isdigit() for c in password)
+
+
+def test_generate_strong_password_short_length():
+    password = AzureDatabaseDeployer().generate_strong_password(length=3)
+    assert len(password) == 3
+    assert any(c.isupper() for c in password)
+    assert any(c.islower() for c in password)
+    assert any(c.isdigit() for c in password)
+
+
+def test_connection_strings_escape_password_delimiters():
+    from urllib.parse import unquote_plus, urlparse
+
+    password = "p@ss#w%rd&^*"
+    urls = AzureDatabaseDeployer()._build_connection_strings("db.example.com", password)
+
+    for url in urls.values():
+        parsed = urlparse(url)
+        assert parsed.hostname == "db.example.com"
+        assert parsed.port == 5432
+        assert unquote_plus(parsed.password) == password
+    assert urls["connection_string"].endswith("/securewave_vpn?sslmode=require")
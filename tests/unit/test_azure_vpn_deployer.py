@@ -0,0 +1,32 @@
+import base64
+
+import pytest
+from cryptography.hazmat.primitives.asymmetric.x25519 import X25519PrivateKey
+from cryptography.hazmat.primitives.serialization import Encoding, PublicFormat
+
+from infrastructure.azure_vpn_deployer import AzureVPNDeployer
+
+
+def test_generate_wireguard_keypair_public_key_matches_private_key():
+    private_key, public_key = AzureVPNDeployer().generate_wireguard_keypair()
+    private_bytes = base64.b64decode(private_key)
+    assert len(private_bytes) == 32
+    derived = X25519PrivateKey.from_private_bytes(private_bytes).public_key()
+    assert base64.b64encode(derived.public_bytes(Encoding.Raw, PublicFormat.Raw)).decode() == public_key
+
+
+def test_continent_of_groups_regions_and_rejects_unknown():
+    assert AzureVPNDeployer.continent_of("westeurope") == "Europe"
+    assert "westeurope" in AzureVPNDeployer._by_continent()["Europe"]
+    with pytest.raises(ValueError):
+        AzureVPNDeployer.continent_of("not-a-region")
+
+
+def test_cloud_init_config_substitutes_key_and_port_only():
+    config = AzureVPNDeployer()._generate_cloud_init_config("private+key/=")
+    assert "PrivateKey = private+key/=" in config
+    assert "ListenPort = 51820" in config
+    assert "ufw allow 51820/udp" in config
+    # Shell variables in the embedded scripts are passed through untouched
+    assert "echo $?" in config
+    assert "awk '{print $1}' /proc/loadavg" in config
@@ -0,0 +1,124 @@
+import subprocess
+import threading
+
+import httpx
+import psycopg2
+from psycopg2 import extensions
+
+from infrastructure.database_backup_manager import DatabaseBackupManager
+
+
+class _FakeCursor:
+    def __init__(self, conn):
+        self.conn = conn
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute(self, query):
+        with self.conn.lock:
+            self.conn.executed.append(query)
+        if "n % 3 = 2" in query:
+            self.conn.notices.append(
+                'WARNING:  analyze failed: public.broken: relation "broken" does not exist\n'
+            )
+
+
+class _FakeConnection:
+    def __init__(self, executed, lock):
+        self.executed = executed
+        self.lock = lock
+        self.autocommit = False
+        self.closed = False
+        self.notices = ["WARNING:  stale notice from an earlier borrower\n"]
+        self.info = type("Info", (), {"transaction_status": extensions.TRANSACTION_STATUS_IDLE})()
+
+    def cursor(self):
+        return _FakeCursor(self)
+
+    def close(self):
+        self.closed = True
+
+    def rollback(self):
+        pass
+
+
+def test_analyze_tables_parallel_partitions_work_and_collects_failures(monkeypatch):
+    executed, lock, opened = [], threading.Lock(), []
+
+    def connect(dsn=None, **kwargs):
+        conn = _FakeConnection(executed, lock)
+        opened.append(conn)
+        return conn
+
+    monkeypatch.setattr(psycopg2, "connect", connect)
+
+    manager = DatabaseBackupManager(max_parallel_analyze=3)
+    monkeypatch.setattr(manager, "_get_connection_string", lambda: "postgresql://example")
+    failures = manager._analyze_tables_parallel(table_count=10)
+
+    assert sorted(q.split("WHERE n % ")[1].split()[:3] for q in executed) == [
+        ["3", "=", "0"], ["3", "=", "1"], ["3", "=", "2"]
+    ]
+    assert failures == ['public.broken: relation "broken" does not exist']
+    assert 1 <= len(opened) <= 3
+    assert all(conn.autocommit and not conn.closed for conn in opened)
+
+    # Later checks reuse pooled connections instead of reconnecting
+    assert manager._test_connection()
+    assert len(opened) <= 3
+
+    assert manager._analyze_tables_parallel(table_count=0) == []
+
+
+def test_show_server_reuses_recent_result(monkeypatch):
+    manager = DatabaseBackupManager()
+    manager._arm_credentials = ("token", "subscription")
+    calls = []
+
+    def arm_request(method, url, body=None):
+        calls.append((method, url))
+        return httpx.Response(200, json={"location": "westeurope", "properties": {"state": "Ready"}})
+
+    monkeypatch.setattr(manager, "_arm_request", arm_request)
+
+    assert manager._get_server_location() == "westeurope"
+    assert manager._show_server()["state"] == "Ready"
+    assert len(calls) == 1
+
+    assert manager._show_server(ttl=0)["state"] == "Ready"
+    assert len(calls) == 2
+
+
+def test_pg_dump_compression_follows_client_version(monkeypatch):
+    from infrastructure import database_backup_manager as module
+
+    def fake_run(version):
+        def run(args, **kwargs):
+            return subprocess.CompletedProcess(args, 0, stdout=f"pg_dump (PostgreSQL) {version}\n")
+        return run
+
+    cases = (
+        ("16.2", ("--compress=zstd:3",)),
+        ("16.2 (Ubuntu 16.2-1.pgdg22.04+1)", ("--compress=zstd:3",)),
+        ("14.11", ("-Z", "3")),
+    )
+    for version, expected in cases:
+        module._pg_dump_compress_args.cache_clear()
+        monkeypatch.setattr(module.subprocess, "run", fake_run(version))
+        assert module._pg_dump_compress_args() == expected
+    module._pg_dump_compress_args.cache_clear()
+
+
+def test_latest_backup_meta_picks_newest_completion(monkeypatch):
+    manager = DatabaseBackupManager()
+    monkeypatch.setattr(manager, "_arm_get_all", lambda path: [
+        {"name": "a", "properties": {"completedTime": "2026-01-02T00:00:00+00:00"}},
+        {"name": "b", "properties": {"completedTime": "2026-01-03T00:00:00+00:00"}},
+        {"name": "c", "properties": {}},
+    ])
+
+    assert manager._latest_backup_meta() == {"count": 3, "latest": "2026-01-03T00:00:00+00:00"}
@@ -0,0 +1,16 @@
+import os
+import stat
+
+from utils.file_utils import write_private_file
+
+
+def test_write_private_file_replaces_content_owner_only(tmp_path):
+    target = tmp_path / "secrets.json"
+    target.write_text("old")
+    target.chmod(0o644)
+
+    write_private_file(str(target), b"new")
+
+    assert target.read_bytes() == b"new"
+    assert stat.S_IMODE(os.stat(target).st_mode) == 0o600
+    assert [p.name for p in tmp_path.iterdir()] == ["secrets.json"]
@@ -0,0 +1,22 @@
+import os
+import tempfile
+
+
+def write_private_file(path: str, content: bytes) -> None:
+    """
+    Atomically write a file that is only readable by its owner
+
+    The temp file is created with mode 0600 and renamed over the target, so
+    there is no window where credentials exist with umask permissions and
+    readers never see a partially written file.
+    """
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)), prefix=".tmp-")
+    try:
+        try:
+            os.write(fd, content)
+        finally:
+            os.close(fd)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
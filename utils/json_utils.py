@@ -0,0 +1,18 @@
+import json
+
+try:
+    import orjson  # Optional: faster JSON parsing and serialization
+except ImportError:
+    orjson = None
+
+
+def loads_json(data):
+    """Parse JSON from a str or bytes document (az output, ARM response bodies)"""
+    return orjson.loads(data) if orjson else json.loads(data)
+
+
+def dump_json(data) -> bytes:
+    """Serialize data as indented JSON bytes"""
+    if orjson:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2)
+    return json.dumps(data, indent=2).encode()